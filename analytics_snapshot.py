@@ -0,0 +1,262 @@
+# analytics_snapshot.py
+"""
+Local Parquet snapshots of the conference data, queried with DuckDB.
+
+    python analytics_snapshot.py [--conference spring-2025]    # refresh a snapshot
+
+A snapshot is a folder under SNAPSHOT_DIR, one per conference:
+
+    snapshots/conference=<name>/
+        attendees.parquet     rewritten on every refresh (small, mutable)
+        ce_reports.parquet    rewritten on every refresh (upserted in place)
+        sessions.parquet      the schedule the snapshot was taken with
+        scanlog/part-*.parquet  append-only; each refresh adds the scans
+                                past the last exported id
+        state.json            export cursor and refresh time
+
+The admin reports (attendees with scans, the CE matrix and the raw log) run
+as DuckDB SQL over these files instead of against the production database,
+and any earlier conference's snapshot can be loaded the same way. The
+conference=<name> folder names double as a hive partition, so
+season_query() can run one query over every snapshot at once.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+
+import duckdb
+import pandas as pd
+
+from reports import LOCAL_TZ, ce_report_from_attendance
+from schedule import Schedule, Session
+
+SNAPSHOT_DIR = os.getenv(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"),
+)
+SNAPSHOT_CONFERENCE = os.getenv("SNAPSHOT_CONFERENCE", "current")
+# scanlog parts are merged into one file once there are more than this many
+SNAPSHOT_MAX_PARTS = int(os.getenv("SNAPSHOT_MAX_PARTS", "50"))
+
+
+def _sql_path(path: str) -> str:
+    """A file path or glob as a quoted SQL string literal."""
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _scan_frame(rows) -> pd.DataFrame:
+    """scanlog rows with their UTC timestamp and a naive conference-local time."""
+    df = pd.DataFrame(rows, columns=["id", "badge_id", "timestamp"])
+    ts = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+    df["timestamp"] = ts
+    df["local_time"] = ts.dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+    return df.astype({"id": "int64", "badge_id": "int64"})
+
+
+def list_snapshots() -> list[str]:
+    """Names of the conferences with a snapshot, newest refresh first."""
+    snaps = [Snapshot(os.path.basename(p).split("=", 1)[1])
+             for p in glob.glob(os.path.join(SNAPSHOT_DIR, "conference=*"))]
+    snaps.sort(key=lambda s: s.state.get("refreshed_at", ""), reverse=True)
+    return [s.name for s in snaps]
+
+
+class Snapshot:
+    def __init__(self, name: str = SNAPSHOT_CONFERENCE):
+        self.name = name
+        self.path = os.path.join(SNAPSHOT_DIR, f"conference={name}")
+        self._con = None
+
+    # ─── Export ───────────────────────────────────────────────────────────
+    @property
+    def state(self) -> dict:
+        try:
+            with open(os.path.join(self.path, "state.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: dict):
+        path = os.path.join(self.path, "state.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(f"{path}.tmp", path)
+
+    def refresh(self, schedule: Schedule = None) -> int:
+        """
+        Pull what changed since the last refresh from the database. Returns
+        the number of new scans exported.
+        """
+        from database import iter_table_pages, PAGE_SIZE, SCAN_CACHE_OVERLAP
+        from schedule import get_schedule
+
+        os.makedirs(os.path.join(self.path, "scanlog"), exist_ok=True)
+        state = self.state
+        cursor = state.get("scanlog_id", 0)
+
+        # scanlog is append-only: export only rows past the cursor, less
+        # SCAN_CACHE_OVERLAP ids for scans that committed after a higher id
+        # was read (see database.get_cached_scan_log). Ids already in a part
+        # are skipped, which also covers a refresh interrupted before
+        # state.json was saved.
+        after = max(0, cursor - SCAN_CACHE_OVERLAP)
+        rows = [r for page in iter_table_pages("scanlog", ["badge_id", "timestamp"], key="id",
+                                               after=after, page_size=PAGE_SIZE)
+                for r in page]
+        exported = self._exported_scan_ids(after) if rows else set()
+        rows = [r for r in rows if r["id"] not in exported]
+        if rows:
+            part = os.path.join(self.path, "scanlog", f"part-{rows[0]['id']:012d}.parquet")
+            _write_parquet(_scan_frame(rows), part)
+            cursor = max(cursor, rows[-1]["id"])
+            self._compact_scanlog()
+
+        attendees = [r for page in iter_table_pages("attendees", ["name", "email"],
+                                                    page_size=PAGE_SIZE) for r in page]
+        _write_parquet(pd.DataFrame(attendees, columns=["badge_id", "name", "email"]),
+                       os.path.join(self.path, "attendees.parquet"))
+
+        ce = [r for page in iter_table_pages("ce_reports",
+                                             ["badge_id", "session_title", "attended", "report_date"],
+                                             key="id", page_size=PAGE_SIZE) for r in page]
+        _write_parquet(pd.DataFrame(ce, columns=["id", "badge_id", "session_title",
+                                                 "attended", "report_date"]),
+                       os.path.join(self.path, "ce_reports.parquet"))
+
+        schedule = schedule or get_schedule()
+        _write_parquet(pd.DataFrame(list(schedule), columns=["id", "title", "start", "end"]),
+                       os.path.join(self.path, "sessions.parquet"))
+
+        self._save_state({"scanlog_id": cursor,
+                          "refreshed_at": datetime.datetime.now().isoformat(timespec="seconds")})
+        self._con = None
+        return len(rows)
+
+    def _exported_scan_ids(self, after: int) -> set[int]:
+        scans = os.path.join(self.path, "scanlog", "*.parquet")
+        if not glob.glob(scans):
+            return set()
+        rows = duckdb.connect().execute(
+            f"select id from read_parquet({_sql_path(scans)}) where id > ?", [after]).fetchall()
+        return {r[0] for r in rows}
+
+    def _compact_scanlog(self):
+        parts = sorted(glob.glob(os.path.join(self.path, "scanlog", "part-*.parquet")))
+        if len(parts) <= SNAPSHOT_MAX_PARTS:
+            return
+        merged = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        _write_parquet(merged, parts[0])
+        for p in parts[1:]:
+            os.remove(p)
+
+    # ─── Queries ──────────────────────────────────────────────────────────
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        """An in-memory DuckDB connection with views over this snapshot's files."""
+        if self._con is None:
+            con = duckdb.connect()
+            for view in ("attendees", "ce_reports", "sessions"):
+                path = os.path.join(self.path, f"{view}.parquet")
+                con.execute(f"create view {view} as select * from read_parquet({_sql_path(path)})")
+            scans = os.path.join(self.path, "scanlog", "*.parquet")
+            if glob.glob(scans):
+                con.execute(f"create view scanlog as select * from read_parquet({_sql_path(scans)})")
+            else:
+                con.execute("create view scanlog as select 0::bigint id, 0::bigint badge_id, "
+                            "now() \"timestamp\", now()::timestamp local_time where false")
+            self._con = con
+        return self._con
+
+    def query(self, sql: str, params=None) -> pd.DataFrame:
+        return self.connect().execute(sql, params or []).df()
+
+    def schedule(self) -> Schedule:
+        """The schedule saved with this snapshot."""
+        df = self.query('select id, title, "start", "end" from sessions')
+        return Schedule(Session(int(r.id), r.title, r.start.to_pydatetime(), r.end.to_pydatetime())
+                        for r in df.itertuples())
+
+    def attendees_with_scans(self) -> pd.DataFrame:
+        """Badge ID | Name | Email | All Scans, as on the admin page."""
+        return self.query("""
+            select a.badge_id as "Badge ID", a.name as "Name", a.email as "Email",
+                   coalesce(string_agg(strftime(s.local_time, '%Y-%m-%d %H:%M:%S'), ', '
+                                       order by s.local_time), '') as "All Scans"
+              from attendees a
+              left join scanlog s using (badge_id)
+             group by all
+             order by "Badge ID"
+        """)
+
+    def raw_log(self) -> pd.DataFrame:
+        """badge_id | name | email | timestamp, newest first."""
+        return self.query("""
+            select s.badge_id, coalesce(a.name, '') as name,
+                   coalesce(a.email, '') as email, s.local_time as "timestamp"
+              from scanlog s
+              left join attendees a using (badge_id)
+             order by s.local_time desc
+        """)
+
+    def ce_report(self, schedule: Schedule = None) -> pd.DataFrame:
+        """
+        The CE matrix for `schedule` (default: the snapshot's whole schedule),
+        attributing scans to sessions the way sql/006_session_attendance.sql does.
+        """
+        schedule = schedule if schedule is not None else self.schedule()
+        if not len(schedule):
+            return ce_report_from_attendance([], [])
+        rows = self.query("""
+            select distinct s.badge_id, ss.id as session_id,
+                   coalesce(a.name, '') as name, coalesce(a.email, '') as email
+              from scanlog s
+              join sessions ss on s.local_time between ss."start" and ss."end"
+              left join attendees a using (badge_id)
+             where ss.id in (select unnest(?))
+        """, [[s.id for s in schedule]])
+        # badges that scanned in the window without matching a session
+        scanned = self.query("""
+            select distinct s.badge_id,
+                   coalesce(a.name, '') as name, coalesce(a.email, '') as email
+              from scanlog s
+              left join attendees a using (badge_id)
+             where s.local_time between ? and ?
+        """, [min(s.start for s in schedule), max(s.end for s in schedule)])
+        return ce_report_from_attendance(rows.to_dict("records"), schedule.sessions,
+                                         scanned.to_dict("records"))
+
+
+def season_query(sql: str, params=None) -> pd.DataFrame:
+    """
+    Run SQL over every snapshot at once. Views attendees, scanlog and
+    ce_reports each carry a `conference` column.
+    """
+    con = duckdb.connect()
+    for view, pattern in (("attendees", "attendees.parquet"),
+                          ("ce_reports", "ce_reports.parquet"),
+                          ("scanlog", os.path.join("scanlog", "*.parquet"))):
+        files = os.path.join(SNAPSHOT_DIR, "conference=*", pattern)
+        con.execute(f"create view {view} as select * from "
+                    f"read_parquet({_sql_path(files)}, hive_partitioning = true)")
+    return con.execute(sql, params or []).df()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Refresh a local analytics snapshot.")
+    ap.add_argument("--conference", default=SNAPSHOT_CONFERENCE,
+                    help="snapshot name (default: SNAPSHOT_CONFERENCE or 'current')")
+    args = ap.parse_args()
+
+    new_scans = Snapshot(args.conference).refresh()
+    print(f"✅ Done! Snapshot '{args.conference}' refreshed ({new_scans} new scans).")
+
+
+if __name__ == "__main__":
+    main()
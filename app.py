@@ -1,16 +1,21 @@
 import datetime
 import pandas as pd
 import streamlit as st
-import qrcode
-import numpy as np
-import cv2
 import os
-from io import BytesIO
-from PIL import Image
+import uuid
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from database import get_all_attendees, log_scan
-from database import get_scan_log
+from supabase import Client
+from supabase_client import get_client
+from database import log_scan, log_scans
+from database import get_scan_log, get_cached_scan_log, get_attendee_index
+from database import get_session_attendance, get_badges_scanned_between
+from database import DUPLICATE_SCAN, SCAN_DEDUP_SECS
+from database import SCAN_JOURNAL_PATH
+from reports import ce_report_from_attendance, flattened_log
+from schedule import get_schedule, reload_schedule, SCHEDULE_SOURCE
+from qr_cache import get_qr_png
+from qr_decode import decode_qr, decode_all_qr, parse_badge_id
+from analytics_snapshot import Snapshot, list_snapshots, SNAPSHOT_CONFERENCE
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +24,6 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 from database import (
     register_attendee,
-    get_all_attendees,
     log_scan,
     get_scan_log,
 )
@@ -27,36 +31,15 @@ from database import (
 def switch_page(page_name: str):
     st.session_state.page = page_name
     st.experimental_rerun()
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-# Conference session definitions with titles and exact times
-conference_sessions = [
-    {"title": "Prevention of C.M.", "start": "2025-05-02 08:30", "end": "2025-05-02 10:00"},
-    {"title": "The TDCJ SO Treatment Program", "start": "2025-05-02 10:30", "end": "2025-05-02 12:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 1)", "start": "2025-05-02 13:30", "end": "2025-05-02 15:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 2)", "start": "2025-05-02 15:30", "end": "2025-05-02 17:00"},
-    {"title": "Use of Polygraph Exams in Treatment", "start": "2025-05-03 08:30", "end": "2025-05-03 10:00"},
-    {"title": "Challenges, Lessons Learned...", "start": "2025-05-03 10:30", "end": "2025-05-03 12:00"},
-    {"title": "Treating Clients with Mild Autism", "start": "2025-05-03 13:30", "end": "2025-05-03 15:00"},
-    {"title": "Unpacking the Offense Cycle", "start": "2025-05-03 15:30", "end": "2025-05-03 17:00"},
-    {"title": "Risk Assessment Reports", "start": "2025-05-04 08:30", "end": "2025-05-04 10:00"},
-    {"title": "Chaperon Training", "start": "2025-05-04 10:30", "end": "2025-05-04 12:00"},
-    {"title": "Legal and Strategy Aspects of Deregistration", "start": "2025-05-04 13:30", "end": "2025-05-04 15:00"},
-    {"title": "RNR Approach to Adolescent Assessment", "start": "2025-05-04 15:30", "end": "2025-05-04 17:00"},
-]
-
-
-# ─── Load .env & initialize Supabase client ───────────────────────────────
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+
+# ─── Shared Supabase client (one per process; see supabase_client.py) ─────
+supabase: Client = get_client()
 
 # ─── Import your database helper wrappers ──────────────────────────────────
 from database import (
     register_attendee,
-    get_all_attendees,
     log_scan,
     get_scan_log,
 )
@@ -66,11 +49,8 @@ def switch_page(page_name: str):
     st.session_state.page = page_name
 
 # ─── Conference sessions ───────────────────────────────────────────────────
-conference_sessions = [
-    {"title": "Prevention of C.M.", "start": "2025-05-02 08:30", "end": "2025-05-02 10:00"},
-    {"title": "The TDCJ SO Treatment Program", "start": "2025-05-02 10:30", "end": "2025-05-02 12:00"},
-    # …and the rest of your sessions…
-]
+# Loaded once per process from sessions.json (or the sessions table) and
+# shared pre-parsed; see schedule.py.
 
 # ─── Init page state ────────────────────────────────────────────────────────
 if 'page' not in st.session_state:
@@ -79,125 +59,141 @@ if 'page' not in st.session_state:
 
 # ─── Utility functions ─────────────────────────────────────────────────────
 def generate_qr_code(badge_id: int) -> bytes:
-    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=5, border=2)
-    qr.add_data(str(badge_id))
-    qr.make(fit=True)
-    img = qr.make_image(fill='black', back_color='white')
-    buf = BytesIO()
-    img.save(buf, format='PNG')
-    return buf.getvalue()
+    return get_qr_png(str(badge_id), box_size=5, border=2, error_correction="L")
+
+
+def kiosk_id() -> str:
+    """
+    This browser's kiosk, for the scan dedup window: ?kiosk=<name> in the
+    URL if given, otherwise an id generated once per browser session.
+    """
+    if "kiosk_id" not in st.session_state:
+        st.session_state.kiosk_id = f"kiosk-{uuid.uuid4().hex[:8]}"
+    return st.query_params.get("kiosk") or st.session_state.kiosk_id
+
+
+def is_new_frame(camera_key: str, img_file) -> bool:
+    """
+    st.camera_input hands back the same photo on every rerun; this is True
+    only the first time a camera's current photo is seen, so each photo is
+    decoded and logged once.
+    """
+    handled = st.session_state.setdefault("handled_frames", {})
+    if handled.get(camera_key) == img_file.file_id:
+        return False
+    handled[camera_key] = img_file.file_id
+    return True
+
+
+def forget_frame(camera_key: str):
+    """Let the next rerun handle the current photo again (its write failed)."""
+    st.session_state.get("handled_frames", {}).pop(camera_key, None)
+
+
+def show_check_in(badge_id, name, verb="Checked in"):
+    """Confirm a log_scan() result; buffered modes fall back to the index for the name."""
+    if name is DUPLICATE_SCAN:
+        who = get_attendee_index().name_for(badge_id, badge_id)
+        st.info(f"🔁 Already checked in: {who} (repeat within {SCAN_DEDUP_SECS:g}s, not recorded again)")
+        return
+    name = name or get_attendee_index().name_for(badge_id, badge_id)
+    st.success(f"✅ {verb}: {name}")
 
 
 def run_qr_scanner():
     st.subheader("📷 Scan QR Code")
-    img_file = st.camera_input("Point camera at QR code")
-    if not img_file:
+    img_file = st.camera_input("Point camera at QR code", key="qr_camera")
+    if not img_file or not is_new_frame("qr_camera", img_file):
         return
 
-    img = Image.open(img_file).convert("RGB")
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-    data, points, _ = qr_detector.detectAndDecode(gray)
-    if data:
-        try:
-            badge = int(data)
-        except ValueError:
-            st.warning(f"Unrecognized QR payload: {data}")
-        else:
-            log_scan(badge)
-            st.success(f"✅ Checked in: {badge}")
-    else:
+    data, _ = decode_qr(img_file)
+    if not data:
         st.warning("⚠ QR Code not recognized.")
+        return
 
-    badge_id = data.strip()
-    log_scan(badge_id)
-
-    people = get_all_attendees()
-    person = next((p for p in people if p["badge_id"] == int(badge_id)), None)
-    name = person["name"] if person else badge_id
-    st.success(f"✅ Scanned and checked in: {name}")
-
-
-def generate_ce_report(sessions=None):
-    """
-    Given a list of session dicts (with 'title','start','end'),
-    returns a DataFrame marking ✅ for each attendee who scanned
-    during each session window.
-    """
-    if sessions is None:
-        sessions = conference_sessions
+    badge_id = parse_badge_id(data)
+    if badge_id is None:
+        st.warning(f"Unrecognized QR payload: {data}")
+        return
 
-    logs = get_scan_log()  # list of {badge_id, name, email, timestamp}
-    rows = {}
+    try:
+        name = log_scan(badge_id, kiosk_id())
+    except Exception:
+        forget_frame("qr_camera")
+        raise
+    show_check_in(badge_id, name, verb="Scanned and checked in")
 
-    for log in logs:
-        bid, ts = log["badge_id"], log["timestamp"]
 
-        # initialize this attendee’s row
-        if bid not in rows:
-            rows[bid] = {
-                "Badge ID": bid,
-                "Name":     log["name"],
-                "Email":    log["email"]
-            }
-            for sess in sessions:
-                rows[bid][sess["title"]] = ""
+def run_group_scanner():
+    st.subheader("👥 Group Check-In")
+    img_file = st.camera_input("Hold all badges up to the camera", key="group_camera")
+    if not img_file or not is_new_frame("group_camera", img_file):
+        return
 
-        # check each session window
-        for sess in sessions:
-            start = datetime.datetime.strptime(sess["start"], "%Y-%m-%d %H:%M")
-            end   = datetime.datetime.strptime(sess["end"],   "%Y-%m-%d %H:%M")
-            if start <= ts <= end:
-                rows[bid][sess["title"]] = "✅"
+    payloads = decode_all_qr(img_file)
+    badge_ids = [b for b in map(parse_badge_id, payloads) if b is not None]
+    unreadable = [p for p in payloads if parse_badge_id(p) is None]
+    if unreadable:
+        st.warning(f"Unrecognized QR payloads: {', '.join(unreadable)}")
+    if not badge_ids:
+        st.warning("⚠ No QR codes recognized.")
+        return
 
-    # ensure all session columns exist for everyone
-    for bid in rows:
-        for sess in sessions:
-            rows[bid].setdefault(sess["title"], "")
+    # one bulk write for the whole group; names fall back to the index
+    try:
+        names = log_scans(badge_ids, kiosk_id())
+    except Exception:
+        forget_frame("group_camera")
+        raise
+    index = get_attendee_index()
+    repeats = [bid for bid, name in names.items() if name is DUPLICATE_SCAN]
+    checked_in = {bid: name for bid, name in names.items() if name is not DUPLICATE_SCAN}
+    if checked_in:
+        st.success(f"✅ Checked in {len(checked_in)} attendees:")
+        st.table(pd.DataFrame({
+            "Badge ID": list(checked_in),
+            "Name": [name or index.name_for(bid, "— not registered —")
+                     for bid, name in checked_in.items()],
+        }))
+    if repeats:
+        st.info(f"🔁 Already checked in (repeat within {SCAN_DEDUP_SECS:g}s, not recorded again): "
+                + ", ".join(str(index.name_for(bid, bid)) for bid in repeats))
+
+
+def generate_ce_report(schedule=None):
+    """
+    Given a Schedule (defaults to the whole conference), returns a
+    DataFrame marking ✅ for each attendee who scanned during each
+    session window.
+
+    Scans are attributed to sessions when they're written (see
+    sql/006_session_attendance.sql), so this is a single indexed read.
+    Badges that scanned during the schedule's window without matching a
+    session are listed too, with no marks.
+    """
+    if schedule is None:
+        schedule = get_schedule()
+    if not len(schedule):
+        return ce_report_from_attendance([], [])
 
-    return pd.DataFrame(rows.values())
+    rows = get_session_attendance([s.id for s in schedule])
+    scanned = get_badges_scanned_between(min(s.start for s in schedule),
+                                         max(s.end for s in schedule))
+    return ce_report_from_attendance(rows, schedule.sessions, scanned)
 
 
 def generate_flattened_log():
-    # 1) Fetch registered attendees
-    attendees = get_all_attendees()   # list of dicts: { badge_id, name, email, … }
-    attendee_map = { int(a["badge_id"]): a for a in attendees }
-
-    # 2) Fetch raw scans
-    raw_scans = get_scan_log()        # list of { badge_id, name, email, timestamp }
-
-    # 3) Group scans by badge_id (earliest → latest)
-    scans_by = {}
-    for entry in sorted(raw_scans, key=lambda x: x["timestamp"]):
-        bid = int(entry["badge_id"])
-        scans_by.setdefault(bid, []).append(entry["timestamp"])
-
-    # 4) Build a row for every scanned badge
-    rows = []
-    for bid, times in scans_by.items():
-        # look up registration info if it exists
-        info = attendee_map.get(bid, {})
-        row = {
-            "Badge ID": bid,
-            "Name":      info.get("name", f"<unregistered {bid}>"),
-            "Email":     info.get("email", ""),
-        }
-        # fill Scan 1…Scan 10
-        for i in range(1, 11):
-            if i <= len(times):
-                row[f"Scan {i}"] = times[i-1].strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                row[f"Scan {i}"] = ""
-        rows.append(row)
-
-    # 5) Sort numerically by badge and return
-    rows = sorted(rows, key=lambda r: r["Badge ID"])
-    return pd.DataFrame(rows)
+    """One row per scanned badge with its first ten scans (see reports.flattened_log)."""
+    return flattened_log(get_scan_log(), get_attendee_index().by_badge)
 # ─── Page layouts ────────────────────────────────────────────────────────────
 if st.session_state.page == 'home':
     st.title("📋 Conference Check‑In System")
 
     # QR scanner
-    run_qr_scanner()
+    if st.toggle("Group check-in (several badges in one photo)", key="group_mode"):
+        run_group_scanner()
+    else:
+        run_qr_scanner()
 
 # Manual badge ID
     st.subheader("🔢 Manual Check-In by Badge ID")
@@ -205,39 +201,19 @@ if st.session_state.page == 'home':
 
     if st.button("Check In", key="checkin_manual"):
         if badge_input:
-        # 1) Record the scan
-            log_scan(badge_input)
-
-        # 2) Fetch name (none → resp.data is None)
-            resp = (
-                supabase
-                .table("attendees")
-                .select("name")
-                .eq("badge_id", int(badge_input))
-                .maybe_single()
-                .execute()
-            )
-            if resp is not None and resp.data:
-                name = resp.data.get("name", badge_input)
-            else:
-                name = badge_input
-
-        # 4) Show the confirmation
-            st.success(f"✅ Checked in: {name}")
+        # Record the scan and show the confirmation
+            show_check_in(badge_input, log_scan(badge_input, kiosk_id()))
         else:
             st.warning("Please enter a valid badge ID.")
 
     st.subheader("👤 Manual Check-In by Name")
-    people = get_all_attendees()
+    people = get_attendee_index().attendees
     names = [f"{p['name']} ({p['badge_id']})" for p in people]
     selection = st.selectbox("Select Attendee", names, index=0)
 
     if st.button("Check In Selected", key="checkin_select"):
         bid = int(selection.split("(")[-1].rstrip(")"))
-        log_scan(bid)
-        # lookup the person’s name for that badge
-        name = next(p["name"] for p in people if p["badge_id"] == bid)
-        st.success(f"✅ Checked in: {name} ({bid})")
+        show_check_in(bid, log_scan(bid, kiosk_id()))
 
     # Go to Admin
     if st.button("🔐 Admin Area"):
@@ -250,52 +226,80 @@ elif st.session_state.page == 'admin':
     if st.button("⬅ Back to Home"):
         switch_page('home')
 
+    # Offline journal / write-behind buffer status
+    import database
+    # (a spill left by an earlier write-behind run counts whatever the mode)
+    pending = database.pending_sync_count()
+    if database.SCAN_JOURNAL_PATH or database.WRITE_BEHIND or pending:
+        st.caption(f"⏳ Scans pending sync: {pending}")
+    if database.SCAN_DEDUP_SECS > 0:
+        st.caption(f"🔁 Repeat scans dropped, all kiosks "
+                   f"(within {database.SCAN_DEDUP_SECS:g}s): {database.dropped_scan_count()}")
+
+    # Report source: the live database, or a local Parquet snapshot queried
+    # with DuckDB (analytics_snapshot.py), which keeps admin reporting off
+    # the production database and can reopen past conferences.
+    source = st.radio("Report source", ["Live database", "Snapshot"],
+                      horizontal=True, key="report_source")
+    snap = None
+    if source == "Snapshot":
+        snapshot_names = list_snapshots() or [SNAPSHOT_CONFERENCE]
+        snap = Snapshot(st.selectbox("Conference snapshot", snapshot_names))
+        if not snap.state or st.button("🔄 Refresh snapshot from database"):
+            with st.spinner(f"Exporting to snapshot '{snap.name}'…"):
+                new_scans = snap.refresh()
+            st.success(f"Snapshot '{snap.name}' refreshed ({new_scans} new scans).")
+        st.caption(f"Snapshot '{snap.name}', last refreshed {snap.state['refreshed_at']}")
+
     st.subheader("👥 All Registered Attendees")
 
-    # 1) Fetch attendees & raw scan log
-    attendees = get_all_attendees()   # list of dicts with int badge_id
-    logs      = get_scan_log()        # list of dicts with badge_id (str), timestamp (datetime or repr)
-
-    # 2) Build badge_id → sorted list of timestamp strings
-    scans_map: dict[int, list[str]] = {}
-    for entry in logs:
-        # normalize badge_id to int
-        try:
-            bid = int(entry["badge_id"])
-        except Exception:
-            bid = entry["badge_id"]
-
-        # normalize timestamp to datetime
-        ts = entry["timestamp"]
-        if isinstance(ts, str) and ts.startswith("datetime.datetime"):
-            # strip off the wrapper: datetime.datetime(…)
-            inner = ts.replace("datetime.datetime(", "").rstrip(")")
-            ts = datetime.datetime.fromisoformat(inner)
-        elif isinstance(ts, str):
-            ts = datetime.datetime.fromisoformat(ts)
-
-        # format and collect
-        s = ts.strftime("%Y-%m-%d %H:%M:%S")
-        scans_map.setdefault(bid, []).append(s)
-
-    # sort each attendee’s scans chronologically
-    for bid in scans_map:
-        scans_map[bid].sort()
-
-    # 3) Assemble rows for the DataFrame
-    rows = []
-    for person in attendees:
-        bid   = person["badge_id"]
-        times = scans_map.get(bid, [])
-        rows.append({
-            "Badge ID":  bid,
-            "Name":       person["name"],
-            "Email":      person["email"],
-            "All Scans":  ", ".join(times)
-        })
+    if snap is not None:
+        df_all = snap.attendees_with_scans()
+    else:
+        # 1) Fetch attendees & raw scan log
+        attendees = get_attendee_index().attendees   # list of dicts with int badge_id
+        logs      = get_cached_scan_log() # list of dicts with badge_id (str), timestamp (datetime or repr)
+
+        # 2) Build badge_id → sorted list of timestamp strings
+        scans_map: dict[int, list[str]] = {}
+        for entry in logs:
+            # normalize badge_id to int
+            try:
+                bid = int(entry["badge_id"])
+            except Exception:
+                bid = entry["badge_id"]
+
+            # normalize timestamp to datetime
+            ts = entry["timestamp"]
+            if isinstance(ts, str) and ts.startswith("datetime.datetime"):
+                # strip off the wrapper: datetime.datetime(…)
+                inner = ts.replace("datetime.datetime(", "").rstrip(")")
+                ts = datetime.datetime.fromisoformat(inner)
+            elif isinstance(ts, str):
+                ts = datetime.datetime.fromisoformat(ts)
+
+            # format and collect
+            s = ts.strftime("%Y-%m-%d %H:%M:%S")
+            scans_map.setdefault(bid, []).append(s)
+
+        # sort each attendee’s scans chronologically
+        for bid in scans_map:
+            scans_map[bid].sort()
+
+        # 3) Assemble rows for the DataFrame
+        rows = []
+        for person in attendees:
+            bid   = person["badge_id"]
+            times = scans_map.get(bid, [])
+            rows.append({
+                "Badge ID":  bid,
+                "Name":       person["name"],
+                "Email":      person["email"],
+                "All Scans":  ", ".join(times)
+            })
+        df_all = pd.DataFrame(rows)
 
     # 4) Render table & download button
-    df_all = pd.DataFrame(rows)
     st.dataframe(df_all)
     st.download_button(
         "📥 Download Attendees with Scans",
@@ -309,9 +313,35 @@ elif st.session_state.page == 'admin':
     # ─── CE Credit report ───────────────────────────────────────────────────────
     st.subheader("📜 CE Credit Attendance Report")
 
+    if snap is not None:
+        schedule = snap.schedule()
+    else:
+        from database import backfill_session_attendance, sessions_out_of_sync, sync_sessions
+
+        def sync_attendance(schedule):
+            # attendance is attributed in the database against the sessions
+            # table, so it has to follow the schedule the report is titled from
+            with st.spinner("Updating the sessions table and rebuilding attendance…"):
+                if sync_sessions(schedule):
+                    rows = backfill_session_attendance()
+                    st.success(f"Sessions table updated from the schedule; "
+                               f"attendance rebuilt ({rows} rows).")
+
+        if st.button("🔄 Reload schedule"):
+            schedule = reload_schedule()
+            if SCHEDULE_SOURCE != "db":
+                sync_attendance(schedule)
+        schedule = get_schedule()
+        if SCHEDULE_SOURCE != "db" and sessions_out_of_sync(schedule):
+            st.warning("The sessions table in the database doesn't match the loaded schedule, "
+                       "so CE attendance is being attributed against different session times.")
+            if st.button("Sync sessions table and rebuild attendance"):
+                sync_attendance(schedule)
+
     # Conference dates
-    min_date = datetime.date(2025, 5, 2)
-    max_date = datetime.date(2025, 5, 4)
+    conference_dates = schedule.dates()
+    min_date = conference_dates[0] if conference_dates else datetime.date.today()
+    max_date = conference_dates[-1] if conference_dates else datetime.date.today()
 
     # Default to today if it’s in range, otherwise the first conference day
     today = datetime.date.today()
@@ -326,17 +356,14 @@ elif st.session_state.page == 'admin':
     )
 
     # Filter sessions to that day
-    sessions_for_day = [
-        s for s in conference_sessions
-        if datetime.datetime.strptime(s["start"], "%Y-%m-%d %H:%M").date()
-        == selected_date
-    ]
+    sessions_for_day = schedule.for_date(selected_date)
 
-    if not sessions_for_day:
+    if not len(sessions_for_day):
         st.info(f"No sessions scheduled for {selected_date}.")
     else:
         # Generate & display the report for just those sessions
-        df_ce = generate_ce_report(sessions_for_day)
+        df_ce = snap.ce_report(sessions_for_day) if snap is not None \
+            else generate_ce_report(sessions_for_day)
         st.dataframe(df_ce)
         st.download_button(
             "📥 Download CE Credit Report",
@@ -345,16 +372,20 @@ elif st.session_state.page == 'admin':
             mime="text/csv"
         )
         # … after your CE‐report block …
-        if st.button("💾 Save CE Report to Supabase"):
+        if snap is None and st.button("💾 Save CE Report to Supabase"):
             from database import save_ce_report
-            save_ce_report(df_ce, selected_date)
-            st.success(f"CE report for {selected_date} saved ({len(df_ce)} attendees).")
+            bar = st.progress(0.0, text="Saving CE report…")
+            written = save_ce_report(
+                df_ce, selected_date,
+                progress=lambda done, total: bar.progress(done / total, text=f"Saved {done}/{total} attendees"),
+            )
+            st.success(f"CE report for {selected_date} saved ({len(df_ce)} attendees, {written} rows changed).")
 
     st.markdown("---")
 
     st.subheader("📊 Raw Attendance Log")
-    raw = get_scan_log()
-    df_raw = pd.DataFrame(raw)
+    df_raw = snap.raw_log() if snap is not None \
+        else pd.DataFrame(logs, columns=["badge_id", "name", "email", "timestamp"])
     st.dataframe(df_raw)
     st.download_button(
     "📥 Download Raw Attendance Log",
@@ -363,11 +394,12 @@ elif st.session_state.page == 'admin':
 )
 
 
-# — your usual init —
-load_dotenv()
-supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
 
 def get_next_badge_id():
+    # offline (journal) mode: this runs on every rerun, so use the cached
+    # roster rather than wait on the network after each scan
+    if SCAN_JOURNAL_PATH:
+        return max(get_attendee_index().by_badge, default=0) + 1
     # pull the single highest badge_id, descending, limit=1
     resp = (
       supabase
@@ -400,11 +432,8 @@ with st.sidebar.form("quick_register"):
 
 if submitted:
     try:
-        supabase.table("attendees").insert({
-            "badge_id": int(badge_id),
-            "name":     name,
-            "email":    email
-        }).execute()
+        # register_attendee also invalidates the shared attendee index
+        register_attendee(int(badge_id), name, email)
         st.sidebar.success(f"Registered {name} (# {badge_id})")
     except Exception as e:
         st.sidebar.error(f"Failed to register: {e}")
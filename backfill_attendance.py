@@ -0,0 +1,13 @@
+# backfill_attendance.py
+# Rebuild the session_attendance table from every existing scanlog row.
+# Run after applying sql/006_session_attendance.sql or after editing the
+# schedule:  python backfill_attendance.py
+# When the schedule comes from a file (SCHEDULE_SOURCE isn't "db"), the
+# sessions table is first updated to match it.
+from database import backfill_session_attendance, sync_sessions
+from schedule import SCHEDULE_SOURCE, get_schedule
+
+if SCHEDULE_SOURCE != "db" and sync_sessions(get_schedule()):
+    print(f"Sessions table updated from {SCHEDULE_SOURCE}.")
+count = backfill_session_attendance()
+print(f"✅ Done! Rebuilt session_attendance with {count} rows.")
@@ -0,0 +1,326 @@
+# badges.py
+"""
+Badge PDF rendering, shared by the Streamlit print page (print.py) and the
+command line:
+
+    python badges.py --out conference_badges.pdf [--workers 8]
+
+Large runs are split into page-aligned chunks, rendered in a process pool and
+concatenated in order, so output is identical to a single-canvas render.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+
+from pypdf import PdfWriter
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from qr_cache import QR_CACHE_SIZE, get_qr_image, get_qr_matrix
+
+BADGES_PER_ROW = 3
+BADGE_WIDTH_INCH = 2.3
+BADGE_HEIGHT_INCH = 3.4
+PAGE_WIDTH, PAGE_HEIGHT = letter
+
+# below this many pages a process pool costs more than it saves
+MIN_PAGES_PER_CHUNK = 4
+# pages rendered per temp file when streaming to disk; bounds peak memory
+STREAM_CHUNK_PAGES = 25
+# Render workers are spawned, not forked: the print page runs inside the
+# multithreaded Streamlit server, and a child forked while another session's
+# thread holds a lock (qr_cache, httpx, SQLite) would deadlock on it.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def generate_qr_code_img(data):
+    # served from the shared QR cache, already decoded and ready to draw
+    return get_qr_image(data, box_size=4, border=1)
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _qr_vector_ops(data, border=1):
+    """
+    PDF path operators for a QR code in module units: one `re` per
+    horizontal run of dark modules, then a single fill. Returns (ops, n).
+    """
+    matrix = get_qr_matrix(data, border=border)
+    ops = []
+    for r, row in enumerate(matrix):
+        col, n = 0, len(row)
+        while col < n:
+            if row[col]:
+                start = col
+                while col < n and row[col]:
+                    col += 1
+                ops.append(f"{start} {r} {col - start} 1 re")
+            else:
+                col += 1
+    ops.append("f")
+    return "\n".join(ops), len(matrix)
+
+
+def draw_qr_vector(c, data, x, y, size, border=1):
+    """Draw a QR code as filled rectangles straight from the module matrix."""
+    ops, n = _qr_vector_ops(data, border)
+    c.saveState()
+    c.translate(x, y + size)
+    c.scale(size / n, -size / n)
+    c.addLiteral(ops)
+    c.restoreState()
+
+
+class BadgeLayout:
+    """
+    Page grid for a print run. Badge slot positions are computed once per
+    layout rather than per badge; rows_per_page defaults to as many rows
+    as fit on the page. Raises ValueError if the row doesn't fit across
+    the printable width.
+    """
+
+    def __init__(self, badges_per_row=BADGES_PER_ROW, rows_per_page=None):
+        self.width = BADGE_WIDTH_INCH * inch
+        self.height = BADGE_HEIGHT_INCH * inch
+        x_margin = 0.5 * inch
+        y_margin = 0.5 * inch
+        y_spacing = 0.3 * inch
+        max_per_row = int((PAGE_WIDTH - 2 * x_margin) // self.width)
+        if not 1 <= badges_per_row <= max_per_row:
+            raise ValueError(f"badges_per_row must be between 1 and {max_per_row} "
+                             f"({BADGE_WIDTH_INCH}in badges on a letter page), "
+                             f"got {badges_per_row}")
+        if rows_per_page is not None and rows_per_page < 1:
+            raise ValueError(f"rows_per_page must be at least 1, got {rows_per_page}")
+        x_spacing = ((PAGE_WIDTH - 2 * x_margin - badges_per_row * self.width) / (badges_per_row - 1)
+                     if badges_per_row > 1 else 0)
+
+        row_height = self.height + y_spacing
+        fit = int((PAGE_HEIGHT - 2 * y_margin + y_spacing) // row_height)
+        self.badges_per_row = badges_per_row
+        self.rows_per_page = min(rows_per_page or fit, fit)
+        self.per_page = self.badges_per_row * self.rows_per_page
+
+        # (x, y) of each slot on a page, filled left→right, top→bottom
+        self.slots = [
+            (x_margin + col * (self.width + x_spacing),
+             PAGE_HEIGHT - y_margin - (row + 1) * row_height + y_spacing)
+            for row in range(self.rows_per_page)
+            for col in range(self.badges_per_row)
+        ]
+
+
+def badges_per_page(badges_per_row=BADGES_PER_ROW, rows_per_page=None):
+    return BadgeLayout(badges_per_row, rows_per_page).per_page
+
+
+def _define_badge_templates(c, layout):
+    """
+    The static parts of every badge (border and "Badge #:" label), drawn
+    once as the "badge" form XObject, plus a "sheet" form that places it in
+    every slot of a full page.
+    """
+    c.beginForm("badge", lowerx=0, lowery=0, upperx=layout.width, uppery=layout.height)
+    c.rect(0, 0, layout.width, layout.height)
+    c.setFont("Helvetica", 10)
+    c.drawString(0.1 * inch, layout.height - 0.9 * inch, "Badge #:")
+    c.endForm()
+
+    c.beginForm("sheet")
+    for x, y in layout.slots:
+        c.saveState()
+        c.translate(x, y)
+        c.doForm("badge")
+        c.restoreState()
+    c.endForm()
+
+
+class _TextCursor:
+    """
+    Writes strings at absolute positions inside one text object using short
+    relative Td moves instead of a full Tm matrix per string.
+    """
+
+    def __init__(self, text, x, y):
+        self.text, self.x, self.y = text, x, y
+
+    def write(self, x, y, value):
+        # moveCursor's dy is measured downwards
+        self.text.moveCursor(x - self.x, self.y - y)
+        self.text.textOut(value)
+        self.x, self.y = x, y
+
+
+def _render(attendees, qr_mode="raster", badges_per_row=BADGES_PER_ROW,
+            rows_per_page=None, out=None) -> bytes:
+    """Render one chunk; returns the PDF bytes, or writes them to path `out`."""
+    buffer = BytesIO()
+    c = canvas.Canvas(out or buffer, pagesize=letter)
+
+    layout = BadgeLayout(badges_per_row, rows_per_page)
+    _define_badge_templates(c, layout)
+    name_dy = layout.height - 0.4 * inch
+    email_dy = layout.height - 0.7 * inch
+    number_dx = 0.1 * inch + c.stringWidth("Badge #: ", "Helvetica", 10)
+    number_dy = layout.height - 0.9 * inch
+    qr_dx = layout.width / 2 - 0.4 * inch
+    qr_dy = 0.2 * inch
+
+    for start in range(0, len(attendees), layout.per_page):
+        if start:
+            c.showPage()
+        page = list(zip(layout.slots, attendees[start:start + layout.per_page]))
+
+        # Static template: the whole sheet at once, or one badge per filled slot
+        if len(page) == layout.per_page:
+            c.doForm("sheet")
+        else:
+            for (x, y), _ in page:
+                c.saveState()
+                c.translate(x, y)
+                c.doForm("badge")
+                c.restoreState()
+
+        # Dynamic text, batched per font: all names, then emails and numbers
+        names = c.beginText(0, 0)
+        names.setFont("Helvetica-Bold", 14)
+        cursor = _TextCursor(names, 0, 0)
+        for (x, y), attendee in page:
+            cursor.write(x + 0.1 * inch, y + name_dy, attendee['name'])
+        c.drawText(names)
+
+        details = c.beginText(0, 0)
+        details.setFont("Helvetica", 10)
+        cursor = _TextCursor(details, 0, 0)
+        for (x, y), attendee in page:
+            cursor.write(x + 0.1 * inch, y + email_dy, attendee['email'])
+            cursor.write(x + number_dx, y + number_dy, str(attendee['badge_id']))
+        c.drawText(details)
+
+        # QR codes
+        for (x, y), attendee in page:
+            badge_id = str(attendee['badge_id'])
+            if qr_mode == "vector":
+                draw_qr_vector(c, badge_id, x + qr_dx, y + qr_dy, 0.8 * inch)
+            else:
+                img = generate_qr_code_img(badge_id)
+                c.drawInlineImage(img, x + qr_dx, y + qr_dy, width=0.8 * inch, height=0.8 * inch)
+
+    c.save()
+    return None if out else buffer.getvalue()
+
+
+def _page_aligned_chunks(attendees, workers, per_page):
+    """Split attendees into chunks that each start on a fresh page."""
+    pages = -(-len(attendees) // per_page)
+    pages_per_chunk = max(MIN_PAGES_PER_CHUNK, -(-pages // workers))
+    size = pages_per_chunk * per_page
+    return [attendees[i:i + size] for i in range(0, len(attendees), size)]
+
+
+def create_badge_pdf(attendees, workers=1, qr_mode="raster",
+                     badges_per_row=BADGES_PER_ROW, rows_per_page=None):
+    """
+    Render badges for `attendees` (dicts with badge_id, name, email) into a
+    letter-size PDF and return it as a BytesIO. With workers > 1, page-aligned
+    chunks are rendered in parallel processes and merged in order.
+
+    qr_mode="raster" embeds each QR code as an inline bitmap; "vector" draws
+    the module matrix as filled rectangles, which renders faster.
+    badges_per_row / rows_per_page set the page grid.
+    """
+    attendees = list(attendees)
+    per_page = badges_per_page(badges_per_row, rows_per_page)
+    render = partial(_render, qr_mode=qr_mode, badges_per_row=badges_per_row,
+                     rows_per_page=rows_per_page)
+    chunks = _page_aligned_chunks(attendees, workers, per_page) if workers > 1 else [attendees]
+
+    if len(chunks) <= 1:
+        buffer = BytesIO(render(attendees))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=_MP_CONTEXT) as pool:
+            parts = list(pool.map(render, chunks))
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(BytesIO(part))
+        buffer = BytesIO()
+        writer.write(buffer)
+
+    buffer.seek(0)
+    return buffer
+
+
+def _render_to(args, **options):
+    chunk, path = args
+    _render(chunk, out=path, **options)
+    return path
+
+
+def write_badge_pdf(attendees, out_path, workers=1, qr_mode="raster",
+                    badges_per_row=BADGES_PER_ROW, rows_per_page=None,
+                    chunk_pages=STREAM_CHUNK_PAGES):
+    """
+    Streaming form of create_badge_pdf: renders `chunk_pages` pages at a
+    time to temporary files (in parallel if workers > 1) and concatenates
+    them into `out_path`, so no full-document canvas or BytesIO is ever
+    held in memory. Returns out_path.
+    """
+    attendees = list(attendees)
+    per_page = badges_per_page(badges_per_row, rows_per_page)
+    size = chunk_pages * per_page
+    chunks = [attendees[i:i + size] for i in range(0, len(attendees), size)] or [[]]
+    render = partial(_render_to, qr_mode=qr_mode, badges_per_row=badges_per_row,
+                     rows_per_page=rows_per_page)
+
+    with tempfile.TemporaryDirectory(prefix="badges-") as tmp:
+        jobs = [(chunk, os.path.join(tmp, f"part-{i:05d}.pdf")) for i, chunk in enumerate(chunks)]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                     mp_context=_MP_CONTEXT) as pool:
+                paths = list(pool.map(render, jobs))
+        else:
+            paths = [render(job) for job in jobs]
+
+        if len(paths) == 1:
+            shutil.move(paths[0], out_path)
+        else:
+            writer = PdfWriter()
+            for path in paths:
+                writer.append(path)
+            writer.write(out_path)
+    return out_path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render conference badges to a PDF.")
+    ap.add_argument("--out", default="conference_badges.pdf", help="output PDF path")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="render processes (default: CPU count)")
+    ap.add_argument("--qr-mode", choices=("raster", "vector"), default="raster",
+                    help="draw QR codes as bitmaps or as vector paths")
+    ap.add_argument("--per-row", type=int, default=BADGES_PER_ROW,
+                    help="badges per row")
+    ap.add_argument("--rows", type=int, default=None,
+                    help="rows per page (default: as many as fit)")
+    args = ap.parse_args()
+    try:
+        BadgeLayout(args.per_row, args.rows)
+    except ValueError as e:
+        ap.error(str(e))
+
+    from database import get_all_attendees
+
+    attendees = get_all_attendees(["name", "email"])
+    write_badge_pdf(attendees, args.out, workers=args.workers, qr_mode=args.qr_mode,
+                    badges_per_row=args.per_row, rows_per_page=args.rows)
+    print(f"✅ Done! Saved {len(attendees)} badges to '{args.out}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: badge PDF size and render time, raster vs vector QR codes.
+
+    python benchmarks/bench_badge_qr.py [--counts 1000 10000]
+
+Each mode is timed twice against a throwaway on-disk QR cache: "cold"
+starts with empty caches (a first print run, QR encoding included) and
+"warm" re-renders with the caches populated (a reprint).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def attendees(n):
+    return [{"badge_id": i, "name": f"Attendee {i}", "email": f"attendee{i}@example.com"}
+            for i in range(1, n + 1)]
+
+
+def run(n, mode):
+    import badges
+    import qr_cache
+
+    qr_cache._lru.clear()
+    qr_cache._matrix_lru.clear()
+    badges._qr_vector_ops.cache_clear()
+    people = attendees(n)
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        qr_cache.QR_CACHE_DIR = tmp
+        for _ in ("cold", "warm"):
+            t0 = time.perf_counter()
+            pdf = badges.create_badge_pdf(people, qr_mode=mode)
+            timings.append(time.perf_counter() - t0)
+    return timings, pdf.getbuffer().nbytes
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    args = ap.parse_args()
+
+    print(f"{'badges':>8} {'mode':>7} {'cold s':>8} {'warm s':>8} {'size (KiB)':>11}")
+    for n in args.counts:
+        for mode in ("raster", "vector"):
+            (cold, warm), size = run(n, mode)
+            print(f"{n:>8,} {mode:>7} {cold:>8.2f} {warm:>8.2f} {size / 1024:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
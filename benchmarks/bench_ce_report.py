@@ -0,0 +1,83 @@
+"""
+Benchmark: CE credit matching, legacy nested loops vs reports.ce_report_frame.
+
+    python benchmarks/bench_ce_report.py [--scans 100000] [--sessions 50]
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from reports import ce_report_frame
+
+
+def legacy_ce_report(logs, sessions):
+    """The original app.generate_ce_report loop, kept here as the baseline."""
+    rows = {}
+    for log in logs:
+        bid, ts = log["badge_id"], log["timestamp"]
+        if bid not in rows:
+            rows[bid] = {"Badge ID": bid, "Name": log["name"], "Email": log["email"]}
+            for sess in sessions:
+                rows[bid][sess["title"]] = ""
+        for sess in sessions:
+            start = datetime.datetime.strptime(sess["start"], "%Y-%m-%d %H:%M")
+            end   = datetime.datetime.strptime(sess["end"],   "%Y-%m-%d %H:%M")
+            if start <= ts <= end:
+                rows[bid][sess["title"]] = "✅"
+    return pd.DataFrame(rows.values())
+
+
+def make_data(n_scans, n_sessions, n_attendees=5000, days=3, seed=42):
+    rng = random.Random(seed)
+    day0 = datetime.datetime(2025, 5, 2, 8, 0)
+    per_day = -(-n_sessions // days)
+    sessions = []
+    for i in range(n_sessions):
+        day, slot = divmod(i, per_day)
+        start = day0 + datetime.timedelta(days=day, minutes=slot * 540 // per_day)
+        end = start + datetime.timedelta(minutes=max(540 // per_day - 10, 5))
+        sessions.append({"title": f"Session {i + 1}",
+                         "start": start.strftime("%Y-%m-%d %H:%M"),
+                         "end":   end.strftime("%Y-%m-%d %H:%M")})
+    logs = []
+    for _ in range(n_scans):
+        bid = rng.randint(1, n_attendees)
+        ts = day0 + datetime.timedelta(days=rng.randrange(days),
+                                       minutes=rng.uniform(0, 560))
+        logs.append({"badge_id": bid, "name": f"Attendee {bid}",
+                     "email": f"a{bid}@example.com", "timestamp": ts})
+    return logs, sessions
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scans", type=int, default=100_000)
+    ap.add_argument("--sessions", type=int, default=50)
+    args = ap.parse_args()
+
+    logs, sessions = make_data(args.scans, args.sessions)
+    new, t_new = timed(ce_report_frame, logs, sessions)
+    old, t_old = timed(legacy_ce_report, logs, sessions)
+
+    pd.testing.assert_frame_equal(new.reset_index(drop=True),
+                                  old.reset_index(drop=True), check_dtype=False)
+    print(f"{args.scans:,} scans x {args.sessions} sessions")
+    print(f"  legacy loops : {t_old:8.3f} s")
+    print(f"  vectorized   : {t_new:8.3f} s")
+    print(f"  speedup      : {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
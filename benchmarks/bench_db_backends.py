@@ -0,0 +1,185 @@
+"""
+Benchmark: database.py over PostgREST vs. direct Postgres (DB_BACKEND=postgres).
+
+    DATABASE_URL=postgresql+psycopg2://postgres@/postgres?host=/tmp/pg \\
+        python benchmarks/bench_db_backends.py [--attendees 2000] [--scans 20000]
+
+    # also time the PostgREST backend (a PostgREST server on the same database)
+    SUPABASE_URL=http://localhost:3000 SUPABASE_KEY=... \\
+        python benchmarks/bench_db_backends.py --postgrest
+
+With no DATABASE_URL, a throwaway local server is started via the pgserver
+package if it is installed. The base tables and sql/*.sql are created on an
+empty database; an existing schema is only dropped with --reset.
+
+Each backend gets a freshly seeded database. Timed operations:
+  register        register_attendee × --registrations
+  all_attendees   get_all_attendees()
+  log_scan        log_scan × --checkins (dedup window off)
+  scan_log        get_scan_log()
+  save_ce         save_ce_report() for every attendee × session
+"""
+import argparse
+import datetime
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The Supabase tables that sql/*.sql builds on
+BASE_TABLES = """
+create table attendees (
+    badge_id bigint primary key,
+    name     text,
+    email    text,
+    scan1 timestamptz, scan2 timestamptz, scan3 timestamptz, scan4 timestamptz,
+    scan5 timestamptz, scan6 timestamptz, scan7 timestamptz, scan8 timestamptz,
+    scan9 timestamptz, scan10 timestamptz
+);
+create table scanlog (
+    id          bigserial primary key,
+    badge_id    bigint,
+    "timestamp" timestamptz default now()
+);
+create table ce_reports (
+    id            bigserial primary key,
+    badge_id      bigint,
+    session_title text,
+    attended      boolean,
+    report_date   date
+);
+"""
+
+
+def start_local_server():
+    import tempfile
+    import pgserver
+
+    server = pgserver.get_server(tempfile.mkdtemp(prefix="bench-pg-"), cleanup_mode="delete")
+    uri = server.get_uri()  # postgresql://postgres:@/postgres?host=...
+    return server, uri.replace("postgresql://", "postgresql+psycopg2://", 1)
+
+
+def create_schema(engine, reset):
+    from sqlalchemy import inspect, text
+
+    with engine.begin() as conn:
+        if inspect(conn).has_table("attendees"):
+            if not reset:
+                sys.exit("attendees already exists; use an empty database or pass --reset")
+            conn.execute(text("drop schema public cascade; create schema public;"))
+        conn.execute(text(BASE_TABLES))
+        # raw cursor, no parameters: the migrations contain literal % (format())
+        cursor = conn.connection.cursor()
+        for path in sorted(glob.glob(os.path.join(ROOT, "sql", "*.sql"))):
+            with open(path, encoding="utf-8") as f:
+                cursor.execute(f.read())
+
+
+def seed(engine, attendees, scans, schedule):
+    """Reset to `attendees` registrations and `scans` scans spread over the schedule."""
+    from sqlalchemy import text
+
+    first, last = schedule.sessions[0].start, schedule.sessions[-1].end
+    with engine.begin() as conn:
+        conn.execute(text("truncate attendees, scanlog, ce_reports, session_attendance "
+                          "restart identity"))
+        conn.execute(text("insert into attendees (badge_id, name, email) "
+                          "select i, 'Attendee ' || i, 'attendee' || i || '@example.com' "
+                          "from generate_series(1, :n) i"), {"n": attendees})
+        conn.execute(text("insert into scanlog (badge_id, \"timestamp\") "
+                          "select 1 + (i * 7919) % :n, "
+                          "       (cast(:first as timestamp) + (cast(:last as timestamp) - "
+                          "        cast(:first as timestamp)) * random()) "
+                          "         at time zone 'America/Chicago' "
+                          "from generate_series(1, :m) i"),
+                     {"n": attendees, "m": scans, "first": first, "last": last})
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def run(database, engine, backend, args, schedule):
+    import pandas as pd
+
+    seed(engine, args.attendees, args.scans, schedule)
+    database.DB_BACKEND = backend
+    database._dedup.window = 0
+    database.invalidate_attendee_index()
+    results = {}
+
+    new_ids = range(args.attendees + 1, args.attendees + 1 + args.registrations)
+    results["register"], _ = timed(lambda: [
+        database.register_attendee(i, f"New {i}", f"new{i}@example.com") for i in new_ids])
+
+    results["all_attendees"], people = timed(lambda: database.get_all_attendees(["name", "email"]))
+
+    badges = [1 + (i * 31) % args.attendees for i in range(args.checkins)]
+    results["log_scan"], _ = timed(lambda: [database.log_scan(b) for b in badges])
+
+    results["scan_log"], logs = timed(database.get_scan_log)
+
+    titles = schedule.titles
+    df = pd.DataFrame({"Badge ID": [p["badge_id"] for p in people],
+                       "Name": [p["name"] for p in people],
+                       "Email": [p["email"] for p in people]})
+    for j, title in enumerate(titles):
+        df[title] = ["✅" if (p["badge_id"] + j) % 3 else "" for p in people]
+    results["save_ce"], written = timed(
+        lambda: database.save_ce_report(df, datetime.date(2025, 1, 1)))
+
+    sizes = {"all_attendees": len(people), "scan_log": len(logs), "save_ce": written,
+             "register": args.registrations, "log_scan": args.checkins}
+    return results, sizes
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--attendees", type=int, default=2000)
+    ap.add_argument("--scans", type=int, default=20000)
+    ap.add_argument("--registrations", type=int, default=200)
+    ap.add_argument("--checkins", type=int, default=500)
+    ap.add_argument("--postgrest", action="store_true",
+                    help="also time the PostgREST backend (SUPABASE_URL/SUPABASE_KEY)")
+    ap.add_argument("--reset", action="store_true",
+                    help="drop and recreate the public schema if it already has tables")
+    args = ap.parse_args()
+
+    server = None
+    if not os.getenv("DATABASE_URL"):
+        server, os.environ["DATABASE_URL"] = start_local_server()
+    os.environ["DB_BACKEND"] = "postgres"
+    os.environ.setdefault("DB_POOL_SIZE", "2")
+
+    import database
+    from main import get_engine
+    from schedule import get_schedule
+
+    engine = get_engine()
+    schedule = get_schedule()
+    create_schema(engine, args.reset)
+
+    backends = ["postgres"] + (["supabase"] if args.postgrest else [])
+    print(f"{args.attendees} attendees, {args.scans} scans, {len(schedule)} sessions")
+    print(f"{'operation':>14} {'rows':>7} " + " ".join(f"{b + ' s':>12}" for b in backends))
+    table = {}
+    for backend in backends:
+        results, sizes = run(database, engine, backend, args, schedule)
+        for op, secs in results.items():
+            table.setdefault(op, [sizes[op]]).append(secs)
+    for op, (rows, *secs) in table.items():
+        print(f"{op:>14} {rows:>7} " + " ".join(f"{s:>12.3f}" for s in secs))
+
+    engine.dispose()
+    if server is not None:
+        server.cleanup()
+
+
+if __name__ == "__main__":
+    main()
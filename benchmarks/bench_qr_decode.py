@@ -0,0 +1,96 @@
+"""
+Benchmark: QR decode rate and latency on synthetic camera frames.
+
+    python benchmarks/bench_qr_decode.py [--frames 1920x1080] [--blur 0 1.5 3] [--rotate 0 15 40]
+
+Every image in qr_codes/ is pasted onto a noisy camera-sized frame, then
+rotated and blurred by each combination of --rotate degrees and --blur sigma.
+Two decoders are compared:
+
+  baseline  – a new cv2.QRCodeDetector per frame, at native resolution
+              (what the scanner pages did before qr_decode.py)
+  pipeline  – qr_decode.decode_qr
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def make_frame(code, size, angle, sigma, rng):
+    """`code` (gray array) at ~30% of frame height, rotated, blurred, noisy."""
+    width, height = size
+    side = int(height * 0.3)
+    code = cv2.resize(code, (side, side), interpolation=cv2.INTER_NEAREST)
+    frame = np.full((height, width), 170, np.uint8)
+    x, y = (width - side) // 2, (height - side) // 2
+    frame[y:y + side, x:x + side] = code
+    if angle:
+        m = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        frame = cv2.warpAffine(frame, m, (width, height), borderValue=170)
+    if sigma:
+        frame = cv2.GaussianBlur(frame, (0, 0), sigma)
+    noise = rng.normal(0, 6, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def baseline(frame):
+    data, _, _ = cv2.QRCodeDetector().detectAndDecode(frame)
+    return data or None, "fast" if data else None
+
+
+def run(decoder, frames, expected):
+    latencies, hits, passes = [], 0, {}
+    for frame, want in zip(frames, expected):
+        t0 = time.perf_counter()
+        data, how = decoder(frame)
+        latencies.append(time.perf_counter() - t0)
+        if data is not None and data.strip() == want:
+            hits += 1
+            passes[how] = passes.get(how, 0) + 1
+    ms = np.array(latencies) * 1000
+    return hits / len(frames), ms.mean(), np.percentile(ms, 95), passes
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--codes", default=os.path.join(ROOT, "qr_codes"))
+    ap.add_argument("--frames", default="1920x1080", help="camera frame size WxH")
+    ap.add_argument("--blur", type=float, nargs="+", default=[0, 1.5, 3])
+    ap.add_argument("--rotate", type=float, nargs="+", default=[0, 15, 40])
+    ap.add_argument("--limit", type=int, default=30, help="max images from --codes")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    from qr_decode import decode_qr, pyzbar
+
+    size = tuple(int(v) for v in args.frames.lower().split("x"))
+    rng = np.random.default_rng(args.seed)
+    paths = sorted(glob.glob(os.path.join(args.codes, "qr_*.png")))[:args.limit]
+    codes = [(cv2.imread(p, cv2.IMREAD_GRAYSCALE),
+              os.path.basename(p)[3:-4]) for p in paths]  # qr_07.png → "07"
+
+    print(f"{len(codes)} codes, {size[0]}x{size[1]} frames, "
+          f"pyzbar {'available' if pyzbar else 'not available'}")
+    print(f"{'rotate':>6} {'blur':>5} {'decoder':>9} {'rate':>6} {'mean ms':>8} "
+          f"{'p95 ms':>7}  passes")
+    for angle in args.rotate:
+        for sigma in args.blur:
+            frames = [make_frame(code, size, angle, sigma, rng) for code, _ in codes]
+            expected = [want for _, want in codes]
+            for name, decoder in (("baseline", baseline), ("pipeline", decode_qr)):
+                rate, mean, p95, passes = run(decoder, frames, expected)
+                detail = " ".join(f"{k}={v}" for k, v in sorted(passes.items()))
+                print(f"{angle:>6g} {sigma:>5g} {name:>9} {rate:>6.0%} {mean:>8.1f} "
+                      f"{p95:>7.1f}  {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark suite: the admin reports and badge rendering on a seeded synthetic conference.
+
+    python benchmarks/suite.py [--scales small,medium] [--repeat 5]
+    python benchmarks/suite.py --compare benchmarks/results/<earlier>.json
+
+Each scale point builds a conference with benchmarks/synthetic.py (same
+--seed, same data) and points database.py at an in-memory stand-in for
+Supabase, so the real query, paging and report code runs with no network:
+
+  scan_log       database.get_scan_log(), stitched from PAGE_SIZE pages
+  ce_report      get_session_attendance() + reports.ce_report_from_attendance,
+                 as app.generate_ce_report does
+  ce_report_scans  reports.ce_report_frame over the raw scan log
+  flattened_log  reports.flattened_log, as app.generate_flattened_log does
+  badge_pdf      badges.create_badge_pdf for the first --badges attendees
+
+Results (median and min of --repeat runs, plus git commit and machine info)
+are written as JSON to --out. With --compare, medians are checked against an
+earlier results file and the run exits 1 if any slowed by more than
+--threshold (and by at least --min-delta seconds, so millisecond jitter on
+the small cases isn't reported).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# name: (attendees, scans, sessions, days)
+SCALES = {
+    "small":  (500, 5_000, 12, 3),
+    "medium": (2_000, 20_000, 24, 3),
+    "large":  (10_000, 100_000, 48, 4),
+}
+
+
+def timed(fn, repeat):
+    fn()  # warm-up: imports, font loading, first-touch allocations
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median": statistics.median(times), "min": min(times)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(name, args):
+    import badges
+    import database
+    import reports
+    from synthetic import InMemorySupabase, make_conference
+
+    attendees, scans, sessions, days = SCALES[name]
+    conf = make_conference(attendees, scans, sessions, days, seed=args.seed)
+    schedule = conf["sessions"]
+
+    database.DB_BACKEND = "supabase"
+    database.supabase = InMemorySupabase(conf)
+    database.invalidate_attendee_index()
+    database.reset_scan_log_cache()
+    index = database.get_attendee_index()
+    logs = database.get_scan_log()
+
+    def ce_report():
+        rows = database.get_session_attendance([s.id for s in schedule])
+        return reports.ce_report_from_attendance(rows, schedule.sessions)
+
+    people = index.attendees[:args.badges]
+    cases = {
+        "scan_log":        database.get_scan_log,
+        "ce_report":       ce_report,
+        "ce_report_scans": lambda: reports.ce_report_frame(logs, schedule.as_dicts(),
+                                                           parsed=schedule.parsed),
+        "flattened_log":   lambda: reports.flattened_log(database.get_scan_log(),
+                                                         index.by_badge),
+        "badge_pdf":       lambda: badges.create_badge_pdf(people),
+    }
+    results = {case: timed(fn, args.repeat) for case, fn in cases.items()}
+    rows = {"scan_log": len(logs), "ce_report": len(conf["session_attendance"]),
+            "ce_report_scans": len(logs), "flattened_log": len(logs),
+            "badge_pdf": len(people)}
+    for case in results:
+        results[case]["rows"] = rows[case]
+    return {"params": {"attendees": attendees, "scans": scans,
+                       "sessions": sessions, "days": days},
+            "results": results}
+
+
+def compare(current, baseline, threshold, min_delta):
+    """Print the change in each median; returns the (scale, case) pairs that regressed."""
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit') or '?'} ({baseline['meta']['timestamp']}):")
+    for scale, run in current["scales"].items():
+        base = baseline["scales"].get(scale)
+        if base is None or base["params"] != run["params"]:
+            print(f"  {scale}: no comparable baseline, skipped")
+            continue
+        for case, r in run["results"].items():
+            if case not in base["results"]:
+                continue
+            old, new = base["results"][case]["median"], r["median"]
+            change = new / old - 1 if old else 0.0
+            flag = ""
+            if change > threshold and new - old >= min_delta:
+                flag = "  ⚠️ regression"
+                regressions.append((scale, case))
+            print(f"  {scale:>7} {case:>16} {old:>9.4f} → {new:>9.4f} s {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scales", default="small,medium",
+                    help=f"comma-separated, from: {', '.join(SCALES)} (default: small,medium)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--badges", type=int, default=200,
+                    help="attendees rendered by badge_pdf (default 200)")
+    ap.add_argument("--out", default=None,
+                    help="results file (default benchmarks/results/<timestamp>.json)")
+    ap.add_argument("--compare", metavar="BASELINE",
+                    help="earlier results file to check for regressions")
+    ap.add_argument("--threshold", type=float, default=0.15,
+                    help="median slowdown counted as a regression (default 0.15 = 15%%)")
+    ap.add_argument("--min-delta", type=float, default=0.01,
+                    help="ignore slowdowns smaller than this many seconds (default 0.01)")
+    args = ap.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        ap.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    # database.py builds a Supabase client at import; it is swapped for the
+    # in-memory stand-in before any query, so placeholder settings are enough
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ["DB_BACKEND"] = "supabase"
+    os.environ["SCAN_WRITE_BEHIND"] = "0"
+
+    now = datetime.datetime.now()
+    report = {
+        "meta": {"timestamp": now.isoformat(timespec="seconds"), "commit": git_commit(),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count(), "seed": args.seed, "repeat": args.repeat,
+                 "badges": args.badges},
+        "scales": {},
+    }
+    print(f"{'scale':>7} {'case':>16} {'rows':>8} {'median s':>10} {'min s':>10}")
+    for scale in scales:
+        run = report["scales"][scale] = run_scale(scale, args)
+        for case, r in run["results"].items():
+            print(f"{scale:>7} {case:>16} {r['rows']:>8} {r['median']:>10.4f} {r['min']:>10.4f}")
+
+    out = args.out or os.path.join(ROOT, "benchmarks", "results",
+                                   now.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold,
+                                  args.min_delta)
+
+    print(f"✅ Done! Results written to {out}.")
+    if regressions:
+        sys.exit(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
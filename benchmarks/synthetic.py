@@ -0,0 +1,192 @@
+"""
+Seeded synthetic conference data, and an in-memory stand-in for the Supabase
+client so database.py's real query code can be timed without a network.
+
+    conf = make_conference(attendees=2000, scans=20000, sessions=24, days=3, seed=1)
+    database.supabase = InMemorySupabase(conf)
+
+Same seed and sizes → identical data, so runs are comparable across commits.
+"""
+import datetime
+import random
+from zoneinfo import ZoneInfo
+
+LOCAL_TZ = ZoneInfo("America/Chicago")
+DAY0 = datetime.datetime(2025, 5, 2, 8, 0)
+DAY_MINUTES = 9 * 60
+
+
+def make_conference(attendees, scans, sessions, days, seed=0):
+    """
+    Returns {"attendees", "sessions", "scanlog", "session_attendance"}:
+    attendees 1..N, S sessions spread evenly over `days` conference days,
+    and M scans at random times during those days, as stored rows (scan
+    timestamps are ISO strings in UTC, as PostgREST returns them).
+    """
+    from schedule import Schedule, Session
+
+    rng = random.Random(seed)
+    people = [{"badge_id": i, "name": f"Attendee {i}", "email": f"attendee{i}@example.com"}
+              for i in range(1, attendees + 1)]
+
+    per_day = -(-sessions // days)
+    slot = DAY_MINUTES // per_day
+    schedule = Schedule(
+        Session(i + 1, f"Session {i + 1}",
+                DAY0 + datetime.timedelta(days=i // per_day, minutes=(i % per_day) * slot),
+                DAY0 + datetime.timedelta(days=i // per_day,
+                                          minutes=(i % per_day) * slot + max(slot - 10, 5)))
+        for i in range(sessions)
+    )
+
+    scanlog = []
+    for sid in range(1, scans + 1):
+        local = DAY0 + datetime.timedelta(days=rng.randrange(days),
+                                          minutes=rng.uniform(0, DAY_MINUTES))
+        scanlog.append({"id": sid, "badge_id": rng.randint(1, attendees),
+                        "timestamp": local.replace(tzinfo=LOCAL_TZ)
+                                          .astimezone(datetime.timezone.utc).isoformat()})
+
+    return {"attendees": people, "sessions": schedule, "scanlog": scanlog,
+            "session_attendance": _attribute(scanlog, schedule)}
+
+
+def _attribute(scanlog, schedule):
+    """(badge_id, session_id) pairs, as the sql/006 trigger would record them."""
+    seen = set()
+    for scan in scanlog:
+        local = datetime.datetime.fromisoformat(scan["timestamp"]) \
+                        .astimezone(LOCAL_TZ).replace(tzinfo=None)
+        for s in schedule.at(local):
+            seen.add((scan["badge_id"], s.id))
+    return [{"badge_id": b, "session_id": s} for b, s in sorted(seen)]
+
+
+# ─── In-memory Supabase ──────────────────────────────────────────────────────
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """The subset of postgrest's query builder that database.py uses."""
+
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.columns, self.filters, self.orders = None, [], []
+        self.lo, self.hi = 0, None
+
+    def select(self, columns):
+        self.columns = None if columns == "*" else columns.split(",")
+        return self
+
+    def _filter(self, op, col, value):
+        self.filters.append((op, col, value))
+        return self
+
+    def eq(self, col, value):
+        return self._filter("eq", col, value)
+
+    def gt(self, col, value):
+        return self._filter("gt", col, value)
+
+    def gte(self, col, value):
+        return self._filter("gte", col, value)
+
+    def lte(self, col, value):
+        return self._filter("lte", col, value)
+
+    def in_(self, col, values):
+        return self._filter("in", col, tuple(values))
+
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.hi = self.lo + n
+        return self
+
+    def range(self, lo, hi):
+        self.lo, self.hi = lo, hi + 1
+        return self
+
+    def execute(self):
+        rows = self.db._result(self.table, tuple(self.filters), tuple(self.orders))
+        rows = rows[self.lo:self.hi]
+        cols = self.columns or [c for c in rows[0] if c != _PARSED_TS] if rows else []
+        # fresh dicts per call, like decoding a JSON response
+        return _Response([{c: r.get(c) for c in cols} for r in rows])
+
+
+# scan rows carry their timestamp pre-parsed under this key, so the stand-in's
+# own filtering and sorting stay cheap next to the code being measured
+_PARSED_TS = "\0timestamp"
+
+
+def _key(value):
+    # filter values: timestamps compare as instants, whatever their offset
+    if isinstance(value, str) and len(value) > 18 and value[10] == "T":
+        return datetime.datetime.fromisoformat(value)
+    return value
+
+
+def _field(col):
+    if col == "timestamp":
+        return lambda r: r[_PARSED_TS]
+    return lambda r: r[col]
+
+
+_OPS = {
+    "eq":  lambda a, b: a == b,
+    "gt":  lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lte": lambda a, b: a <= b,
+    "in":  lambda a, b: a in b,
+}
+
+
+class InMemorySupabase:
+    """
+    Serves attendees, scan_log_view, session_attendance_view and sessions
+    from a make_conference() dict. Filtered, sorted results are memoised per
+    query shape, so paging through one result costs what slicing does.
+    """
+
+    def __init__(self, conf):
+        names = {a["badge_id"]: a for a in conf["attendees"]}
+        scans = [{**s, _PARSED_TS: datetime.datetime.fromisoformat(s["timestamp"])}
+                 for s in conf["scanlog"]]
+        self.tables = {
+            "attendees": conf["attendees"],
+            "scanlog": scans,
+            "scan_log_view": [
+                {**s, "name": names.get(s["badge_id"], {}).get("name", ""),
+                 "email": names.get(s["badge_id"], {}).get("email", "")}
+                for s in scans],
+            "session_attendance_view": [
+                {**r, "name": names.get(r["badge_id"], {}).get("name", ""),
+                 "email": names.get(r["badge_id"], {}).get("email", "")}
+                for r in conf["session_attendance"]],
+            "sessions": [{"id": s.id, "title": s.title,
+                          "starts_at": s.start.isoformat(), "ends_at": s.end.isoformat()}
+                         for s in conf["sessions"]],
+        }
+        self._memo = {}
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def _result(self, table, filters, orders):
+        key = (table, filters, orders)
+        if key not in self._memo:
+            rows = self.tables[table]
+            for op, col, value in filters:
+                test, get = _OPS[op], _field(col)
+                value = value if op == "in" else _key(value)
+                rows = [r for r in rows if test(get(r), value)]
+            for col, desc in reversed(orders):
+                rows = sorted(rows, key=_field(col), reverse=desc)
+            self._memo = {key: rows}  # keep only the query being paged
+        return self._memo[key]
+
@@ -8,8 +8,11 @@ import os
 from io import BytesIO
 from PIL import Image
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from supabase_client import get_client
 from database import get_all_attendees, log_scan
+from schedule import get_schedule
+from qr_decode import decode_qr
 from database import get_scan_log
 
 # Load environment variables
@@ -27,31 +30,13 @@ from database import (
 def switch_page(page_name: str):
     st.session_state.page = page_name
     st.experimental_rerun()
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Conference session definitions with titles and exact times
-conference_sessions = [
-    {"title": "Prevention of C.M.", "start": "2025-05-02 08:30", "end": "2025-05-02 10:00"},
-    {"title": "The TDCJ SO Treatment Program", "start": "2025-05-02 10:30", "end": "2025-05-02 12:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 1)", "start": "2025-05-02 13:30", "end": "2025-05-02 15:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 2)", "start": "2025-05-02 15:30", "end": "2025-05-02 17:00"},
-    {"title": "Use of Polygraph Exams in Treatment", "start": "2025-05-03 08:30", "end": "2025-05-03 10:00"},
-    {"title": "Challenges, Lessons Learned...", "start": "2025-05-03 10:30", "end": "2025-05-03 12:00"},
-    {"title": "Treating Clients with Mild Autism", "start": "2025-05-03 13:30", "end": "2025-05-03 15:00"},
-    {"title": "Unpacking the Offense Cycle", "start": "2025-05-03 15:30", "end": "2025-05-03 17:00"},
-    {"title": "Risk Assessment Reports", "start": "2025-05-04 08:30", "end": "2025-05-04 10:00"},
-    {"title": "Chaperon Training", "start": "2025-05-04 10:30", "end": "2025-05-04 12:00"},
-    {"title": "Legal and Strategy Aspects of Deregistration", "start": "2025-05-04 13:30", "end": "2025-05-04 15:00"},
-    {"title": "RNR Approach to Adolescent Assessment", "start": "2025-05-04 15:30", "end": "2025-05-04 17:00"},
-]
-
-
-# ─── Load .env & initialize Supabase client ───────────────────────────────
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+conference_sessions = get_schedule().as_dicts()  # shared registry, see schedule.py
+
+
+# ─── Shared Supabase client (one per process; see supabase_client.py) ─────
+supabase: Client = get_client()
 
 # ─── Import your database helper wrappers ──────────────────────────────────
 from database import (
@@ -66,11 +51,7 @@ def switch_page(page_name: str):
     st.session_state.page = page_name
 
 # ─── Conference sessions ───────────────────────────────────────────────────
-conference_sessions = [
-    {"title": "Prevention of C.M.", "start": "2025-05-02 08:30", "end": "2025-05-02 10:00"},
-    {"title": "The TDCJ SO Treatment Program", "start": "2025-05-02 10:30", "end": "2025-05-02 12:00"},
-    # …and the rest of your sessions…
-]
+conference_sessions = get_schedule().as_dicts()  # shared registry, see schedule.py
 
 # ─── Init page state ────────────────────────────────────────────────────────
 if 'page' not in st.session_state:
@@ -94,19 +75,10 @@ def run_qr_scanner():
     if not img_file:
         return
 
-    img = Image.open(img_file).convert("RGB")
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-    data, points, _ = qr_detector.detectAndDecode(gray)
-    if data:
-        try:
-            badge = int(data)
-        except ValueError:
-            st.warning(f"Unrecognized QR payload: {data}")
-        else:
-            log_scan(badge)
-            st.success(f"✅ Checked in: {badge}")
-    else:
+    data, _ = decode_qr(img_file)
+    if not data:
         st.warning("⚠ QR Code not recognized.")
+        return
 
     badge_id = data.strip()
     log_scan(badge_id)
@@ -366,9 +338,6 @@ elif st.session_state.page == 'admin':
 )
 
 
-# — your usual init —
-load_dotenv()
-supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
 
 def get_next_badge_id():
     # pull the single highest badge_id, descending, limit=1
@@ -2,126 +2,870 @@
 from zoneinfo import ZoneInfo
 import pandas as pd
 import os
+import time
+import queue
+import atexit
+import uuid
+import socket
 import datetime
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import threading
+from contextlib import contextmanager
+from supabase import Client
+from scan_journal import ScanJournal
+from supabase_client import get_client
 
-# ─── Initialize Supabase client ─────────────────────────────────────────────
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# ─── Supabase client (shared, pooled; see supabase_client.py) ───────────────
+supabase: Client = get_client()
+
+# DB_BACKEND=postgres runs attendee, scan and CE report queries straight
+# against Postgres over main.py's pooled SQLAlchemy engine (pg_backend.py)
+# instead of PostgREST.
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase")
+if DB_BACKEND == "postgres":
+    import pg_backend
 
 
 # ─── Attendees ───────────────────────────────────────────────────────────────
 def register_attendee(badge_id: int, name: str, email: str):
     """Insert a new attendee row into Supabase."""
-    supabase.table("attendees") \
-            .insert({"badge_id": badge_id, "name": name, "email": email}) \
-            .execute()
+    if DB_BACKEND == "postgres":
+        pg_backend.insert_attendee(badge_id, name, email)
+    else:
+        supabase.table("attendees") \
+                .insert({"badge_id": badge_id, "name": name, "email": email}) \
+                .execute()
+    invalidate_attendee_index()
+
+
+def iter_table_pages(table, columns="*", key="badge_id", after=None,
+                     page_size: int = 1000):
+    """
+    Walk a table (or view) in `key` order, one keyed page at a time
+    (key > last seen, limit page_size), starting after `after` if given, so
+    large tables aren't cut off by PostgREST's max-rows cap. Yields lists
+    of dicts.
+
+    Only an empty page ends the walk: a server whose max-rows is below
+    page_size returns short pages long before the end of the table.
+    """
+    if columns != "*" and key not in columns:
+        columns = [key, *columns]
+    if DB_BACKEND == "postgres":
+        yield from pg_backend.iter_table_pages(table, columns, key, after, page_size)
+        return
+    select = columns if columns == "*" else ",".join(columns)
+
+    last = after
+    while True:
+        q = supabase.table(table).select(select)
+        if last is not None:
+            q = q.gt(key, last)
+        page = q.order(key, desc=False).limit(page_size).execute().data or []
+        if not page:
+            return
+        yield page
+        last = page[-1][key]
+
 
+def iter_attendee_pages(columns="*", page_size: int = 1000, table="attendees"):
+    """The attendees table (or a view over it) in badge_id order, a page at a time."""
+    return iter_table_pages(table, columns, "badge_id", page_size=page_size)
 
-def get_all_attendees():
+
+def get_all_attendees(columns="*"):
     """Fetch all attendees from Supabase as a list of dicts."""
-    resp = supabase.table("attendees") \
-                   .select("*") \
-                   .order("badge_id", desc=False) \
-                   .execute()
-    return resp.data
+    return [row for page in iter_attendee_pages(columns) for row in page]
+
+
+def get_attendees_df(columns="*") -> pd.DataFrame:
+    """All attendees as a DataFrame, built page by page."""
+    frames = [pd.DataFrame(page) for page in iter_attendee_pages(columns)]
+    if not frames:
+        return pd.DataFrame(columns=None if columns == "*" else list(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ─── Badge printing ──────────────────────────────────────────────────────────
+# Badge reads include updated_at, which mark_badges_printed hands back so only
+# badges unchanged since they were rendered are stamped as printed.
+BADGE_COLUMNS = ("name", "email", "updated_at")
+
+
+def get_unprinted_attendees(columns=BADGE_COLUMNS):
+    """Attendees registered or changed since their badge was last printed."""
+    return [row for page in iter_attendee_pages(columns, table="badges_to_print")
+            for row in page]
+
+
+# ids per in_() filter; they travel in the query string, so keep URLs short
+ID_BATCH_SIZE = 200
+
+
+def get_attendees_by_ids(badge_ids, columns=BADGE_COLUMNS):
+    """Attendees with the given badge ids, in badge_id order."""
+    ids = sorted({int(b) for b in badge_ids})
+    if DB_BACKEND == "postgres":
+        return pg_backend.get_attendees_by_ids(ids, ["badge_id", *columns]) if ids else []
+    select = ",".join(["badge_id", *columns])
+    rows = []
+    for i in range(0, len(ids), ID_BATCH_SIZE):
+        rows.extend(supabase.table("attendees")
+                            .select(select)
+                            .in_("badge_id", ids[i:i + ID_BATCH_SIZE])
+                            .order("badge_id")
+                            .execute().data or [])
+    return rows
+
+
+def mark_badges_printed(badges) -> int:
+    """
+    Stamp printed_at on the rendered badges (dicts with badge_id and the
+    updated_at they were read with), server-side via the mark_badges_printed
+    RPC (sql/009_mark_badges_printed.sql). Badges edited since they were read
+    aren't stamped. Returns the number stamped.
+    """
+    payload = [{"badge_id": int(b["badge_id"]), "updated_at": str(b["updated_at"])}
+               for b in badges]
+    stamped = 0
+    for i in range(0, len(payload), PAGE_SIZE):
+        batch = payload[i:i + PAGE_SIZE]
+        if DB_BACKEND == "postgres":
+            stamped += pg_backend.mark_badges_printed(batch)
+        else:
+            stamped += supabase.rpc("mark_badges_printed", {"p_badges": batch}).execute().data or 0
+    return stamped
+
+
+# Shared in-process index of the roster for O(1) lookups by badge or email.
+# Rebuilt after ATTENDEE_INDEX_TTL seconds, or immediately after a
+# registration through register_attendee. Once an index exists, rebuilds
+# run on a background thread and the old index keeps being served, also
+# when a rebuild fails (backend unreachable), so check-in lookups never
+# wait on the network. A failed rebuild is retried after
+# ATTENDEE_INDEX_RETRY seconds.
+ATTENDEE_INDEX_TTL   = float(os.getenv("ATTENDEE_INDEX_TTL", "60"))
+ATTENDEE_INDEX_RETRY = float(os.getenv("ATTENDEE_INDEX_RETRY", "15"))
+
+
+class AttendeeIndex:
+    def __init__(self, attendees: list[dict]):
+        self.attendees = attendees  # badge_id order
+        self.by_badge = {int(a["badge_id"]): a for a in attendees}
+        self.by_email = {a["email"].strip().lower(): a
+                         for a in attendees if a.get("email")}
+        self.built_at = time.monotonic()
+
+    def get(self, badge_id):
+        try:
+            return self.by_badge.get(int(badge_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get_by_email(self, email: str):
+        return self.by_email.get((email or "").strip().lower())
+
+    def name_for(self, badge_id, default=None):
+        a = self.get(badge_id)
+        return a["name"] if a else default
+
+
+_attendee_index: AttendeeIndex | None = None
+_stale_index: AttendeeIndex | None = None   # last index dropped by invalidate
+_attendee_index_lock = threading.Lock()
+_index_generation = 0        # bumped by invalidate, so late rebuilds are discarded
+_index_refreshing = False
+_index_retry_at = 0.0
+
+
+def _rebuild_attendee_index(generation: int):
+    global _attendee_index, _index_refreshing, _index_retry_at
+    try:
+        idx = AttendeeIndex(get_all_attendees(["name", "email"]))
+    except Exception as e:
+        print(f"Attendee index refresh failed, serving the cached roster: {e}")
+        idx = None
+    with _attendee_index_lock:
+        if idx is None:
+            _index_retry_at = time.monotonic() + ATTENDEE_INDEX_RETRY
+        elif generation == _index_generation:
+            _attendee_index = idx
+        _index_refreshing = False
+
+
+def get_attendee_index() -> AttendeeIndex:
+    """
+    Return the shared attendee index. A stale index is returned as-is while
+    a background rebuild runs. Only the first build (or the first after
+    invalidate_attendee_index) waits for the roster, and in journal mode not
+    even that: the last known roster, or an empty one, is served until the
+    rebuild lands.
+    """
+    global _attendee_index, _index_refreshing
+    idx = _attendee_index
+    if idx is not None and time.monotonic() - idx.built_at < ATTENDEE_INDEX_TTL:
+        return idx
+    if idx is None and not SCAN_JOURNAL_PATH:
+        with _attendee_index_lock:
+            if _attendee_index is None:
+                _attendee_index = AttendeeIndex(get_all_attendees(["name", "email"]))
+            return _attendee_index
+
+    with _attendee_index_lock:
+        if not _index_refreshing and time.monotonic() >= _index_retry_at:
+            _index_refreshing = True
+            threading.Thread(target=_rebuild_attendee_index, args=(_index_generation,),
+                             name="attendee-index", daemon=True).start()
+    if idx is not None:
+        return idx
+    return _stale_index or AttendeeIndex([])
+
+
+def invalidate_attendee_index():
+    """Force the next get_attendee_index() call to reload the roster."""
+    global _attendee_index, _stale_index, _index_generation, _index_retry_at
+    with _attendee_index_lock:
+        _stale_index = _attendee_index or _stale_index
+        _attendee_index = None
+        _index_generation += 1
+        _index_retry_at = 0.0
 
 
 # ─── Scanning ────────────────────────────────────────────────────────────────
-def log_scan(badge_id: int):
+# Write-behind mode: log_scan only enqueues, and a background thread flushes
+# the queue through the check_in_many RPC every FLUSH_INTERVAL_MS or every
+# FLUSH_BATCH_SIZE scans, whichever comes first.
+WRITE_BEHIND      = os.getenv("SCAN_WRITE_BEHIND", "0") == "1"
+FLUSH_INTERVAL_MS = int(os.getenv("SCAN_FLUSH_INTERVAL_MS", "500"))
+FLUSH_BATCH_SIZE  = int(os.getenv("SCAN_FLUSH_BATCH_SIZE", "100"))
+
+# Offline journal mode: log_scan appends to a local SQLite journal and a sync
+# worker replays it to Supabase whenever the backend is reachable. Takes
+# precedence over write-behind when SCAN_JOURNAL_PATH is set. Synced rows are
+# deleted from the journal SCAN_JOURNAL_RETENTION_SECS after they sync.
+SCAN_JOURNAL_PATH   = os.getenv("SCAN_JOURNAL_PATH")
+JOURNAL_SYNC_SECS   = float(os.getenv("SCAN_JOURNAL_SYNC_SECS", "2"))
+JOURNAL_RETENTION   = float(os.getenv("SCAN_JOURNAL_RETENTION_SECS", "3600"))
+
+# Write-behind scans that still can't be written at shutdown are spilled to
+# this journal instead of being lost, and replayed when the app next starts.
+SCAN_SPILL_PATH = os.getenv(
+    "SCAN_SPILL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_spill.sqlite"),
+)
+
+# Dedup window: a repeat scan of the same badge from the same kiosk within
+# SCAN_DEDUP_SECS (camera reruns re-submitting a frame, double-tapped
+# buttons) is dropped before it reaches the database. 0 disables it.
+# Every browser kiosk shares one server process, so the check-in page passes
+# its own per-session kiosk id; KIOSK_ID is only the default for callers
+# that don't (scripts, the legacy pages).
+SCAN_DEDUP_SECS = float(os.getenv("SCAN_DEDUP_SECS", "10"))
+KIOSK_ID        = os.getenv("KIOSK_ID") or socket.gethostname()
+
+
+class ScanDedup:
+    """
+    Time-bounded set of recently recorded (kiosk, badge) pairs. Entries are
+    pruned as they expire, so memory stays proportional to one window's
+    worth of scans.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.dropped = 0
+        self._seen: dict[tuple, float] = {}   # insertion order = time order
+        self._lock = threading.Lock()
+
+    def admit(self, badge_id: int, kiosk_id: str = KIOSK_ID) -> bool:
+        """True if this scan should be recorded; False (and counted) if it's a repeat."""
+        if self.window <= 0:
+            return True
+        now = time.monotonic()
+        key = (kiosk_id, badge_id)
+        with self._lock:
+            # drop expired entries from the oldest end
+            while self._seen:
+                oldest = next(iter(self._seen))
+                if now - self._seen[oldest] < self.window:
+                    break
+                del self._seen[oldest]
+            if key in self._seen:
+                self.dropped += 1
+                return False
+            self._seen[key] = now
+            return True
+
+    def forget(self, badge_id: int, kiosk_id: str = KIOSK_ID):
+        """Undo admit() for a scan whose write failed, so a retry goes through."""
+        with self._lock:
+            self._seen.pop((kiosk_id, badge_id), None)
+
+
+_dedup = ScanDedup(SCAN_DEDUP_SECS)
+
+
+class _DuplicateScan:
+    def __repr__(self):
+        return "DUPLICATE_SCAN"
+
+
+# Returned by log_scan (and as a value from log_scans) for a repeat dropped
+# by the dedup window: nothing was written, the earlier scan stands.
+DUPLICATE_SCAN = _DuplicateScan()
+
+_journal: ScanJournal | None = None
+_spill: ScanJournal | None = None
+_journal_lock = threading.Lock()
+
+_scan_queue: "queue.Queue[dict]" = queue.Queue()
+_flush_lock = threading.Lock()
+_flusher_start_lock = threading.Lock()
+_flusher_stop = threading.Event()
+_flusher: threading.Thread | None = None
+
+
+LOCAL_TZ = ZoneInfo("America/Chicago")
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(LOCAL_TZ).isoformat()
+
+
+def log_scan(badge_id: int, kiosk_id: str = KIOSK_ID):
     """
-    1) Insert raw scan event into scanlog
-    2) Update next empty scanN column in attendees
+    Record a check-in in one round trip via the check_in RPC
+    (see sql/001_check_in.sql), which:
+    1) Inserts the raw scan event into scanlog
+    2) Fills the next empty scanN column in attendees, under a row lock
+    Returns the attendee's name, or None if the badge isn't registered.
+
+    In journal or write-behind mode the scan is recorded locally instead and
+    None is returned straight away; a background thread writes it later.
+    Repeats within the dedup window are dropped and return DUPLICATE_SCAN.
+    If the write raises, the scan doesn't count towards the window, so the
+    retry is recorded.
     """
     badge = int(badge_id)
-    local_tz = ZoneInfo("America/Chicago")
-    now_iso  = datetime.datetime.now(local_tz).isoformat()
-
-    # 1) raw log
-    supabase.table("scanlog") \
-            .insert({"badge_id": badge, "timestamp": now_iso}) \
-            .execute()
-
-    # 2) fetch the attendee row
-    resp = supabase.table("attendees") \
-                   .select("*") \
-                   .eq("badge_id", badge) \
+    if not _dedup.admit(badge, kiosk_id):
+        return DUPLICATE_SCAN
+    try:
+        return _record_scan(badge, _now_iso())
+    except Exception:
+        _dedup.forget(badge, kiosk_id)
+        raise
+
+
+def _record_scan(badge: int, now_iso: str):
+    if SCAN_JOURNAL_PATH:
+        get_journal().append(badge, now_iso)
+        return None
+
+    if WRITE_BEHIND:
+        _ensure_flusher()
+        _scan_queue.put({"badge_id": badge, "timestamp": now_iso,
+                         "client_id": str(uuid.uuid4())})
+        return None
+
+    if DB_BACKEND == "postgres":
+        return pg_backend.check_in(badge, now_iso)
+    resp = supabase.rpc("check_in", {"p_badge_id": badge, "p_ts": now_iso}) \
                    .execute()
-    rows = resp.data
-    if not rows:
+    return resp.data
+
+
+def log_scans(badge_ids, kiosk_id: str = KIOSK_ID) -> dict:
+    """
+    Record check-ins for several badges at once (e.g. a group photo), in a
+    single check_in_many call. Duplicate ids are recorded once. Returns
+    {badge_id: name}, with None for unregistered badges and for every badge
+    in journal or write-behind mode, and DUPLICATE_SCAN for badges dropped
+    by the dedup window.
+    """
+    requested = list(dict.fromkeys(int(b) for b in badge_ids))
+    badges = [b for b in requested if _dedup.admit(b, kiosk_id)]
+    names = dict.fromkeys(requested, DUPLICATE_SCAN)
+    names.update(dict.fromkeys(badges))
+    try:
+        names.update(_record_scans(badges, _now_iso()))
+    except Exception:
+        for badge in badges:
+            _dedup.forget(badge, kiosk_id)
+        raise
+    return names
+
+
+def _record_scans(badges: list[int], now_iso: str) -> dict:
+    if SCAN_JOURNAL_PATH:
+        journal = get_journal()
+        for badge in badges:
+            journal.append(badge, now_iso)
+        return {}
+
+    scans = [{"badge_id": badge, "timestamp": now_iso, "client_id": str(uuid.uuid4())}
+             for badge in badges]
+    if WRITE_BEHIND:
+        _ensure_flusher()
+        for scan in scans:
+            _scan_queue.put(scan)
+        return {}
+
+    return {int(r["badge_id"]): r["name"] for r in _write_scans(scans)}
+
+
+def _write_scans(scans: list[dict]):
+    """Write a batch of queued scans in one check_in_many call."""
+    if not scans:
+        return []
+    if DB_BACKEND == "postgres":
+        return pg_backend.check_in_many(scans)
+    resp = supabase.rpc("check_in_many", {"p_scans": scans}).execute()
+    return resp.data or []
+
+
+def _drain_queue(max_items: int, timeout: float) -> list[dict]:
+    """Wait up to `timeout` seconds for scans, returning at most `max_items`."""
+    batch = []
+    deadline = time.monotonic() + timeout
+    while len(batch) < max_items:
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                batch.append(_scan_queue.get_nowait())
+            else:
+                batch.append(_scan_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _flush_loop():
+    while not _flusher_stop.is_set():
+        batch = _drain_queue(FLUSH_BATCH_SIZE, FLUSH_INTERVAL_MS / 1000)
+        if not batch:
+            continue
+        with _flush_lock:
+            try:
+                _write_scans(batch)
+            except Exception as e:
+                # keep the scans and back off; they'll go out with the next batch
+                print(f"Scan flush failed ({len(batch)} queued): {e}")
+                for scan in batch:
+                    _scan_queue.put(scan)
+                _flusher_stop.wait(FLUSH_INTERVAL_MS / 1000)
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
         return
+    with _flusher_start_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher_stop.clear()
+            _flusher = threading.Thread(target=_flush_loop, name="scan-flusher",
+                                        daemon=True)
+            _flusher.start()
+
+
+def _replay_spill():
+    """
+    Start syncing scans spilled by an earlier shutdown, if there are any.
+    Runs at import whatever mode this process is in, so the spill drains
+    (and shows in pending_sync_count) without waiting for a write-behind scan.
+    """
+    global _spill
+    if _spill is None and os.path.exists(SCAN_SPILL_PATH):
+        _spill = ScanJournal(SCAN_SPILL_PATH, retention=JOURNAL_RETENTION)
+        _spill.start_sync_worker(_write_scans, interval=JOURNAL_SYNC_SECS,
+                                 batch_size=FLUSH_BATCH_SIZE)
+
+
+def flush_scans():
+    """
+    Synchronously write everything currently queued. Returns the count
+    written. If a batch fails, it goes back on the queue and the flush
+    stops there; scan_queue_depth() is what's left unwritten.
+    """
+    written = 0
+    with _flush_lock:
+        while True:
+            batch = _drain_queue(FLUSH_BATCH_SIZE, 0)
+            if not batch:
+                break
+            try:
+                _write_scans(batch)
+            except Exception as e:
+                for scan in batch:
+                    _scan_queue.put(scan)
+                print(f"Scan flush failed, {_scan_queue.qsize()} scans remain unwritten: {e}")
+                break
+            written += len(batch)
+    return written
+
+
+def get_journal() -> ScanJournal:
+    """Open the offline scan journal and start its sync worker (once)."""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = ScanJournal(SCAN_JOURNAL_PATH, retention=JOURNAL_RETENTION)
+                _journal.start_sync_worker(_write_scans,
+                                           interval=JOURNAL_SYNC_SECS,
+                                           batch_size=FLUSH_BATCH_SIZE)
+    return _journal
+
+
+def pending_sync_count() -> int:
+    """Scans recorded locally but not yet acknowledged by Supabase."""
+    pending = _scan_queue.qsize()
+    if SCAN_JOURNAL_PATH:
+        pending += get_journal().pending_count()
+    if _spill is not None:
+        pending += _spill.pending_count()
+    return pending
+
+
+def dropped_scan_count() -> int:
+    """Repeat scans dropped by the dedup window since this process started."""
+    return _dedup.dropped
+
+
+def scan_queue_depth() -> int:
+    """Number of scans waiting to be written by the write-behind flusher."""
+    return _scan_queue.qsize()
+
 
-    row = rows[0]
-    updates = {}
-    for i in range(1, 11):
-        col = f"scan{i}"
-        if row.get(col) is None:
-            updates[col] = now_iso
+def shutdown_write_behind():
+    """
+    Stop the flusher thread and write out anything still queued. Scans that
+    can't be written (backend unreachable) are spilled to SCAN_SPILL_PATH.
+    """
+    _flusher_stop.set()
+    if _flusher is not None:
+        _flusher.join(timeout=FLUSH_INTERVAL_MS / 1000 + 5)
+    flush_scans()
+    left = _drain_queue(_scan_queue.qsize(), 0)
+    if left:
+        spill = _spill or ScanJournal(SCAN_SPILL_PATH, retention=JOURNAL_RETENTION)
+        for scan in left:
+            spill.append(scan["badge_id"], scan["timestamp"], scan["client_id"])
+        print(f"Spilled {len(left)} unwritten scans to {SCAN_SPILL_PATH}; "
+              f"they are replayed on the next start.")
+
+
+atexit.register(shutdown_write_behind)
+_replay_spill()
+
+
+# ─── Scan log queries ────────────────────────────────────────────────────────
+SCAN_LOG_COLUMNS = ("badge_id", "name", "email", "timestamp")
+PAGE_SIZE = 1000  # matches PostgREST's default max-rows; paging loops run to an
+                  # empty page, so a lower server cap only costs extra requests
+
+
+def _as_local_iso(ts: datetime.datetime) -> str:
+    """Naive datetimes are conference-local (America/Chicago)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=LOCAL_TZ)
+    return ts.isoformat()
+
+
+def query_scan_log(columns=SCAN_LOG_COLUMNS, start=None, end=None,
+                   badge_id=None, after_id=None, limit=None, offset=0,
+                   order="timestamp", desc=True):
+    """
+    Query scan events joined to attendee name/email in the database
+    (scan_log_view, see sql/004_scan_log_view.sql).
+
+    columns    – view columns to return (id, badge_id, name, email, timestamp)
+    start, end – inclusive datetime bounds on the scan timestamp
+    badge_id   – only scans for this badge
+    after_id   – only scans with id > after_id (incremental fetches)
+    limit      – max rows; None pages through every matching row
+    offset     – rows to skip
+    order      – column to sort by (newest first unless desc=False)
+
+    Returns a list of dicts; "timestamp" values are parsed to datetimes.
+    """
+    # naive bounds are conference-local on both backends
+    start = _as_local_iso(start) if start is not None else None
+    end = _as_local_iso(end) if end is not None else None
+    if DB_BACKEND == "postgres":
+        return pg_backend.query_scan_log(columns, start, end, badge_id, after_id,
+                                         limit, offset, order, desc)
+
+    def build():
+        q = supabase.table("scan_log_view").select(",".join(columns))
+        if start is not None:
+            q = q.gte("timestamp", start)
+        if end is not None:
+            q = q.lte("timestamp", end)
+        if badge_id is not None:
+            q = q.eq("badge_id", int(badge_id))
+        if after_id is not None:
+            q = q.gt("id", after_id)
+        q = q.order(order, desc=desc)
+        # ties (a group check-in shares one timestamp) need a stable order,
+        # or rows can repeat or go missing across .range() pages
+        return q if order == "id" else q.order("id", desc=desc)
+
+    rows = []
+    pos = offset
+    while True:
+        want = PAGE_SIZE if limit is None else min(PAGE_SIZE, offset + limit - pos)
+        if want <= 0:
+            break
+        page = build().range(pos, pos + want - 1).execute().data or []
+        if not page:  # a short page may just be the server's max-rows cap
             break
+        rows.extend(page)
+        pos += len(page)
 
-    if updates:
-        supabase.table("attendees") \
-                .update(updates) \
-                .eq("badge_id", badge) \
-                .execute()
+    if "timestamp" in columns:
+        for r in rows:
+            r["timestamp"] = datetime.datetime.fromisoformat(r["timestamp"])
+    return rows
 
 
-def get_scan_log():
+def get_scan_log(start=None, end=None):
     """
-    Fetch every scan event, then look up each attendee’s name/email in Python.
+    Fetch scan events (newest first), optionally within [start, end].
     Returns a list of dicts: { badge_id, name, email, timestamp }.
     """
-    # 1) grab raw scan events
-    resp_scans = supabase.table("scanlog") \
-                        .select("*") \
-                        .order("timestamp", desc=True) \
-                        .execute()
-    scans = resp_scans.data  # list of { badge_id, timestamp, ... }
-
-    # 2) grab attendees and build a quick lookup
-    attendees = get_all_attendees()  # from database.py
-    attendee_map = { a["badge_id"]: a for a in attendees }
-
-    # 3) stitch them together
-    logs = []
-    for sc in scans:
-        bid = sc["badge_id"]
-        raw_ts = sc["timestamp"]
-        # parse to datetime for your generate_ce_report logic
-        ts = datetime.datetime.fromisoformat(raw_ts)
-        a = attendee_map.get(bid, {})
-        logs.append({
-            "badge_id": bid,
-            "name":      a.get("name", ""),
-            "email":     a.get("email", ""),
-            "timestamp": ts
-        })
-    return logs
-def save_ce_report(df: pd.DataFrame, report_date: datetime.date):
+    return query_scan_log(start=start, end=end)
+
+
+# Process-wide cache of every scan fetched so far, plus the highest scan id
+# seen. Each refresh only asks the database for rows past that cursor, less
+# SCAN_CACHE_OVERLAP ids: scanlog ids are handed out at insert but rows only
+# become visible at commit, so with concurrent kiosks (and check_in_many or
+# journal batches) a scan can show up with an id below rows already read.
+# The overlap is re-read every time and rows already cached are skipped.
+SCAN_CACHE_OVERLAP = int(os.getenv("SCAN_CACHE_OVERLAP", "500"))
+
+_scan_cache: list[dict] = []
+_scan_ids: set[int] = set()
+_scan_cursor = 0
+_scan_cache_lock = threading.Lock()
+
+
+def get_cached_scan_log():
+    """
+    Same rows as get_scan_log(), but fetched incrementally: only scans with
+    an id above the last high-water mark (less the overlap) are requested,
+    and the rest come from the in-process cache. Returned newest first.
+    """
+    global _scan_cursor
+    with _scan_cache_lock:
+        rows = query_scan_log(columns=("id",) + SCAN_LOG_COLUMNS,
+                              after_id=max(0, _scan_cursor - SCAN_CACHE_OVERLAP),
+                              order="id", desc=False)
+        new_rows = [r for r in rows if r["id"] not in _scan_ids]
+        if new_rows:
+            late = new_rows[0]["id"] < _scan_cursor
+            _scan_cache.extend(new_rows)
+            _scan_ids.update(r["id"] for r in new_rows)
+            _scan_cursor = max(_scan_cursor, new_rows[-1]["id"])
+            if late:
+                _scan_cache.sort(key=lambda r: r["id"])
+        return _scan_cache[::-1]
+
+
+def reset_scan_log_cache():
+    """Drop the cached scans so the next call refetches from scratch."""
+    global _scan_cursor
+    with _scan_cache_lock:
+        _scan_cache.clear()
+        _scan_ids.clear()
+        _scan_cursor = 0
+
+
+# ─── Session attendance ──────────────────────────────────────────────────────
+def get_session_attendance(session_ids):
+    """
+    Read write-time session attribution (sql/006_session_attendance.sql)
+    for the given session ids. Returns a list of dicts:
+    { badge_id, session_id, name, email }.
+    """
+    session_ids = [int(i) for i in session_ids]
+    if not session_ids:
+        return []
+    if DB_BACKEND == "postgres":
+        return pg_backend.get_session_attendance(session_ids)
+    rows = []
+    pos = 0
+    while True:
+        page = supabase.table("session_attendance_view") \
+                       .select("badge_id,session_id,name,email") \
+                       .in_("session_id", session_ids) \
+                       .order("badge_id") \
+                       .order("session_id") \
+                       .range(pos, pos + PAGE_SIZE - 1) \
+                       .execute().data or []
+        if not page:
+            return rows
+        rows.extend(page)
+        pos += len(page)
+
+
+def get_badges_scanned_between(start: datetime.datetime, end: datetime.datetime):
+    """
+    One {badge_id, name, email} per badge with a scan in [start, end]
+    (sql/010_badges_scanned_between.sql), in badge_id order. Naive bounds
+    are conference-local.
+    """
+    start, end = _as_local_iso(start), _as_local_iso(end)
+    if DB_BACKEND == "postgres":
+        return pg_backend.get_badges_scanned_between(start, end)
+    rows, last = [], None
+    while True:
+        q = supabase.rpc("badges_scanned_between", {"p_start": start, "p_end": end})
+        if last is not None:
+            q = q.gt("badge_id", last)
+        page = q.order("badge_id").limit(PAGE_SIZE).execute().data or []
+        if not page:
+            return rows
+        rows.extend(page)
+        last = page[-1]["badge_id"]
+
+
+def backfill_session_attendance() -> int:
+    """Rebuild session_attendance from every scanlog row. Returns the row count."""
+    resp = supabase.rpc("backfill_session_attendance", {}).execute()
+    return resp.data
+
+
+# (schedule, out of sync?) from the last check. reload_schedule() hands out a
+# new Schedule, so the table is only read again after a reload or a sync.
+_sessions_sync_state = (None, False)
+
+
+def sessions_out_of_sync(schedule, recheck: bool = False) -> bool:
+    """
+    True if the sessions table, which scans are attributed against
+    (sql/006), differs from `schedule`, e.g. one loaded from sessions.json.
+    The answer is remembered for that Schedule unless `recheck` is set.
+    """
+    global _sessions_sync_state
+    checked, out_of_sync = _sessions_sync_state
+    if checked is schedule and not recheck:
+        return out_of_sync
+    from schedule import load_schedule_db
+    out_of_sync = list(load_schedule_db()) != list(schedule)
+    _sessions_sync_state = (schedule, out_of_sync)
+    return out_of_sync
+
+
+def sync_sessions(schedule) -> bool:
+    """
+    Make the sessions table match `schedule`: upsert its sessions and delete
+    the rest. Returns True if anything changed, in which case attendance
+    needs backfill_session_attendance() to match.
+    """
+    global _sessions_sync_state
+    if not sessions_out_of_sync(schedule, recheck=True):
+        return False
+    ids = [s.id for s in schedule]
+    if ids:
+        supabase.table("sessions") \
+                .upsert([{"id": s.id, "title": s.title,
+                          "starts_at": s.start.isoformat(), "ends_at": s.end.isoformat()}
+                         for s in schedule]) \
+                .execute()
+    q = supabase.table("sessions").delete()
+    q = q.not_.in_("id", ids) if ids else q.gte("id", 0)
+    q.execute()
+    _sessions_sync_state = (schedule, False)
+    return True
+
+
+CE_REPORT_KEY = "badge_id,session_title,report_date"
+
+
+def _saved_ce_marks(report_date: str) -> dict:
+    """(badge_id, session_title) → attended, for rows already saved on that date."""
+    if DB_BACKEND == "postgres":
+        return pg_backend.saved_ce_marks(report_date)
+    saved = {}
+    pos = 0
+    while True:
+        page = supabase.table("ce_reports") \
+                       .select("badge_id,session_title,attended") \
+                       .eq("report_date", report_date) \
+                       .order("badge_id") \
+                       .order("session_title") \
+                       .range(pos, pos + PAGE_SIZE - 1) \
+                       .execute().data or []
+        if not page:
+            return saved
+        for r in page:
+            saved[(r["badge_id"], r["session_title"])] = r["attended"]
+        pos += len(page)
+
+
+@contextmanager
+def _ce_report_writer():
+    """Yields send(rows), upserting CE rows on CE_REPORT_KEY."""
+    if DB_BACKEND == "postgres":
+        # one transaction for the whole save
+        with pg_backend.ce_report_writer() as send:
+            yield send
+        return
+
+    def send(batch):
+        supabase.table("ce_reports") \
+                .upsert(batch, on_conflict=CE_REPORT_KEY) \
+                .execute()
+    yield send
+
+
+def save_ce_report(df: pd.DataFrame, report_date: datetime.date,
+                   batch_size: int = 2000, progress=None) -> int:
     """
     Expect df like:
        Badge ID | Name | Email | [session1] | [session2] | ...
-    This will melt it to one row per session and insert into ce_reports.
+    This melts it to one row per session, a chunk of attendees at a time,
+    and upserts into ce_reports on (badge_id, session_title, report_date)
+    in batches of at most `batch_size` rows (see sql/007_ce_reports_key.sql).
+
+    Only rows whose attended flag differs from what's already saved for
+    that date are sent, so re-saving an unchanged report writes nothing.
+    `progress(done, total)` is called after each chunk of attendees.
+    Returns the number of rows written.
     """
-    # melt wide→long
     id_vars = ["Badge ID", "Name", "Email"]
     value_vars = [c for c in df.columns if c not in id_vars]
-    df_long = (
-        df
-        .melt(id_vars=id_vars, value_vars=value_vars,
-              var_name="session_title", value_name="attended_mark")
-        # convert "✅"→True, ""→False
-        .assign(
-            badge_id       = lambda d: d["Badge ID"].astype(int),
-            attended       = lambda d: d["attended_mark"] == "✅",
-            report_date    = report_date
-        )
-        .loc[:, ["badge_id","session_title","attended","report_date"]]
-    )
-
-    # insert into Supabase
-    records = df_long.to_dict(orient="records")
-    supabase.table("ce_reports").insert(records).execute()
+    if df.empty or not value_vars:
+        return 0
+
+    report_date = report_date.isoformat()
+    saved = _saved_ce_marks(report_date)
+    chunk_rows = max(1, batch_size // len(value_vars))
+
+    pending, written = [], 0
+    with _ce_report_writer() as send:
+        for lo in range(0, len(df), chunk_rows):
+            chunk = df.iloc[lo:lo + chunk_rows]
+            # melt wide→long, "✅"→True, ""→False
+            long = chunk.melt(id_vars=id_vars, value_vars=value_vars,
+                              var_name="session_title", value_name="attended_mark")
+            for bid, title, mark in zip(long["Badge ID"].astype(int),
+                                        long["session_title"],
+                                        long["attended_mark"]):
+                attended = mark == "✅"
+                if saved.get((bid, title)) == attended:
+                    continue
+                pending.append({"badge_id": int(bid), "session_title": title,
+                                "attended": attended, "report_date": report_date})
+
+            while len(pending) >= batch_size:
+                send(pending[:batch_size])
+                written += batch_size
+                pending = pending[batch_size:]
+            if progress:
+                progress(min(lo + chunk_rows, len(df)), len(df))
+
+        if pending:
+            send(pending)
+            written += len(pending)
+    return written
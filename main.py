@@ -1,7 +1,8 @@
 from sqlalchemy import create_engine
-# from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 import os
+import threading
 
 # Load environment variables from .env
 load_dotenv()
@@ -13,18 +14,52 @@ HOST = os.getenv("host")
 PORT = os.getenv("port")
 DBNAME = os.getenv("dbname")
 
-# Construct the SQLAlchemy connection string
-DATABASE_URL = f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
+# Construct the SQLAlchemy connection string (DATABASE_URL overrides, e.g. a local Postgres)
+DATABASE_URL = os.getenv("DATABASE_URL") or \
+    f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}?sslmode=require"
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-# If using Transaction Pooler or Session Pooler, we want to ensure we disable SQLAlchemy client side pooling -
+# Pool settings. Set DB_POOL=null when connecting through Supabase's
+# Transaction Pooler or Session Pooler, which pool on the server side -
 # https://docs.sqlalchemy.org/en/20/core/pooling.html#switching-pool-implementations
-# engine = create_engine(DATABASE_URL, poolclass=NullPool)
-
-# Test the connection
-try:
-    with engine.connect() as connection:
-        print("Connection successful!")
-except Exception as e:
-    print(f"Failed to connect: {e}")
\ No newline at end of file
+DB_POOL         = os.getenv("DB_POOL", "queue")
+DB_POOL_SIZE    = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The process-wide SQLAlchemy engine, created (but not connected) on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if DB_POOL == "null":
+                    _engine = create_engine(DATABASE_URL, poolclass=NullPool)
+                else:
+                    _engine = create_engine(DATABASE_URL,
+                                            pool_size=DB_POOL_SIZE,
+                                            max_overflow=DB_MAX_OVERFLOW,
+                                            pool_timeout=DB_POOL_TIMEOUT,
+                                            pool_recycle=DB_POOL_RECYCLE,
+                                            pool_pre_ping=True)
+    return _engine
+
+
+def __getattr__(name):
+    # `from main import engine` still works, without connecting at import time
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(name)
+
+
+if __name__ == "__main__":
+    # Test the connection
+    try:
+        with get_engine().connect() as connection:
+            print("Connection successful!")
+    except Exception as e:
+        print(f"Failed to connect: {e}")
@@ -0,0 +1,180 @@
+# pg_backend.py
+"""
+Direct-Postgres implementations of database.py's data access, over the
+pooled SQLAlchemy engine from main.py. Selected with DB_BACKEND=postgres.
+
+Each function is the SQL counterpart of one PostgREST call in database.py
+and returns the same shapes, so everything above that layer (the attendee
+index, write-behind flushing, the journal, reports) is shared between
+backends. The same server-side functions and views are used: check_in and
+check_in_many (sql/001–003) and scan_log_view (sql/004).
+"""
+import datetime
+import json
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import column, table as sql_table, text
+from sqlalchemy.dialects.postgresql import insert
+
+from main import get_engine
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_ce_reports = sql_table("ce_reports", column("badge_id"), column("session_title"),
+                        column("attended"), column("report_date"))
+
+
+def _columns(columns) -> str:
+    """A safe SQL column list; names are checked, never interpolated blindly."""
+    if columns == "*":
+        return "*"
+    for c in columns:
+        if not _IDENTIFIER.match(c):
+            raise ValueError(f"bad column name: {c!r}")
+    return ", ".join(f'"{c}"' for c in columns)
+
+
+# ─── Attendees ───────────────────────────────────────────────────────────────
+def insert_attendee(badge_id: int, name: str, email: str):
+    with get_engine().begin() as conn:
+        conn.execute(text("insert into attendees (badge_id, name, email) "
+                          "values (:badge_id, :name, :email)"),
+                     {"badge_id": badge_id, "name": name, "email": email})
+
+
+def iter_table_pages(table, columns="*", key="badge_id", after=None,
+                     page_size: int = 1000):
+    """
+    The whole table in `key` order (after `after`, if given) from one query,
+    streamed through a server-side cursor and yielded page_size rows at a time.
+    """
+    if not _IDENTIFIER.match(table):
+        raise ValueError(f"bad table name: {table!r}")
+    sql = f"select {_columns(columns)} from {table}"
+    params = {}
+    if after is not None:
+        sql += f" where {_columns([key])} > :after"
+        params["after"] = after
+    sql += f" order by {_columns([key])}"
+    with get_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=page_size) \
+                     .execute(text(sql), params)
+        for part in result.mappings().partitions(page_size):
+            yield [dict(r) for r in part]
+
+
+def get_attendees_by_ids(badge_ids: list[int], columns) -> list[dict]:
+    """Attendees with the given badge ids, in badge_id order, from one query."""
+    sql = (f"select {_columns(columns)} from attendees "
+           "where badge_id = any(:ids) order by badge_id")
+    with get_engine().connect() as conn:
+        return [dict(r) for r in conn.execute(text(sql), {"ids": list(badge_ids)}).mappings()]
+
+
+def mark_badges_printed(badges: list[dict]) -> int:
+    """mark_badges_printed() for a batch of {badge_id, updated_at}, in one transaction."""
+    with get_engine().begin() as conn:
+        return conn.execute(text("select public.mark_badges_printed(cast(:p as jsonb))"),
+                            {"p": json.dumps(badges)}).scalar()
+
+
+# ─── Scanning ────────────────────────────────────────────────────────────────
+def check_in(badge_id: int, timestamp: str):
+    """check_in() in its own transaction; returns the attendee's name or None."""
+    with get_engine().begin() as conn:
+        return conn.execute(text("select public.check_in(:b, cast(:ts as timestamptz))"),
+                            {"b": badge_id, "ts": timestamp}).scalar()
+
+
+def check_in_many(scans: list[dict]) -> list[dict]:
+    """check_in_many() for a batch of scans, in one transaction."""
+    with get_engine().begin() as conn:
+        rows = conn.execute(text("select * from public.check_in_many(cast(:p as jsonb))"),
+                            {"p": json.dumps(scans)})
+        return [dict(r) for r in rows.mappings()]
+
+
+def query_scan_log(columns, start=None, end=None, badge_id=None, after_id=None,
+                   limit=None, offset=0, order="timestamp", desc=True):
+    """
+    database.query_scan_log as one query on scan_log_view, without paging.
+    start/end arrive as ISO strings with their offset (database._as_local_iso),
+    so the session TimeZone doesn't change the window.
+    """
+    where, params = [], {}
+    if start is not None:
+        where.append('"timestamp" >= cast(:start as timestamptz)')
+        params["start"] = start
+    if end is not None:
+        where.append('"timestamp" <= cast(:end as timestamptz)')
+        params["end"] = end
+    if badge_id is not None:
+        where.append("badge_id = :badge_id")
+        params["badge_id"] = int(badge_id)
+    if after_id is not None:
+        where.append("id > :after_id")
+        params["after_id"] = after_id
+
+    sql = f"select {_columns(columns)} from scan_log_view"
+    if where:
+        sql += " where " + " and ".join(where)
+    direction = "desc" if desc else "asc"
+    sql += f" order by {_columns([order])} {direction}"
+    if order != "id":
+        sql += f", id {direction}"  # stable order for tied timestamps
+    if limit is not None:
+        sql += " limit :limit"
+        params["limit"] = limit
+    if offset:
+        sql += " offset :offset"
+        params["offset"] = offset
+
+    with get_engine().connect() as conn:
+        return [dict(r) for r in conn.execute(text(sql), params).mappings()]
+
+
+# ─── Session attendance ──────────────────────────────────────────────────────
+def get_session_attendance(session_ids: list[int]) -> list[dict]:
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("select badge_id, session_id, name, email "
+                                 "from session_attendance_view "
+                                 "where session_id = any(:ids) "
+                                 "order by badge_id, session_id"),
+                            {"ids": session_ids})
+        return [dict(r) for r in rows.mappings()]
+
+
+def get_badges_scanned_between(start: str, end: str) -> list[dict]:
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("select * from public.badges_scanned_between("
+                                 "cast(:start as timestamptz), cast(:end as timestamptz))"),
+                            {"start": start, "end": end})
+        return [dict(r) for r in rows.mappings()]
+
+
+# ─── CE reports ──────────────────────────────────────────────────────────────
+def saved_ce_marks(report_date: str) -> dict:
+    """(badge_id, session_title) → attended, for rows already saved on that date."""
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("select badge_id, session_title, attended "
+                                 "from ce_reports where report_date = :d"),
+                            {"d": datetime.date.fromisoformat(report_date)})
+        return {(b, t): a for b, t, a in rows}
+
+
+@contextmanager
+def ce_report_writer():
+    """
+    Yields send(rows), which upserts rows on ce_reports_key. Every batch
+    sent inside the block commits (or rolls back) as one transaction.
+    """
+    stmt = insert(_ce_reports)
+    stmt = stmt.on_conflict_do_update(constraint="ce_reports_key",
+                                      set_={"attended": stmt.excluded.attended})
+    with get_engine().begin() as conn:
+        def send(rows):
+            # executemany; SQLAlchemy batches these into multi-row VALUES
+            conn.execute(stmt, [{**r, "report_date": datetime.date.fromisoformat(r["report_date"])}
+                                for r in rows])
+        yield send
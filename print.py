@@ -1,91 +1,100 @@
+import glob
+import os
+import time
+import uuid
 import streamlit as st
-import qrcode
-from io import BytesIO
-from database import get_all_attendees
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from PIL import Image
+from database import (
+    BADGE_COLUMNS,
+    get_all_attendees,
+    get_unprinted_attendees,
+    get_attendees_by_ids,
+    mark_badges_printed,
+)
+from badges import write_badge_pdf
+
+# Generated PDFs go in Streamlit's static folder and are downloaded from
+# app/static/badges/<random name>.pdf (server.enableStaticServing, see
+# .streamlit/config.toml). That route streams the file from disk, so a PDF
+# is never loaded into the server's memory; Streamlit refuses static files
+# over 200 MB. Names are random because the folder is readable by anyone
+# who can reach the app. PDFs older than BADGE_PDF_MAX_AGE seconds are
+# swept whenever a new one is generated.
+BADGE_PDF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "badges")
+BADGE_PDF_MAX_AGE = float(os.getenv("BADGE_PDF_MAX_AGE", "3600"))
+
+
+def sweep_old_pdfs():
+    cutoff = time.time() - BADGE_PDF_MAX_AGE
+    for path in glob.glob(os.path.join(BADGE_PDF_DIR, "*.pdf")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:  # swept by another session
+            pass
+
+
+def read_pdf(path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
 
 st.set_page_config(layout="wide")
 st.title("🪪 Printable Conference Badges (Multi-page PDF)")
 
-BADGES_PER_ROW = 3
-BADGE_WIDTH_INCH = 2.3
-BADGE_HEIGHT_INCH = 3.4
-PAGE_WIDTH, PAGE_HEIGHT = letter
-
-def generate_qr_code_img(data):
-    qr = qrcode.QRCode(box_size=4, border=1)
-    qr.add_data(data)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    return img
-
-def create_badge_pdf(attendees):
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-
-    x_margin = 0.5 * inch
-    y_margin = 0.5 * inch
-    x_spacing = (PAGE_WIDTH - 2 * x_margin - BADGES_PER_ROW * BADGE_WIDTH_INCH * inch) / (BADGES_PER_ROW - 1)
-    y_spacing = 0.3 * inch
-
-    # Precompute column positions
-    x_positions = [x_margin + i * (BADGE_WIDTH_INCH * inch + x_spacing) for i in range(BADGES_PER_ROW)]
-
-    # Start layout
-    row_height = BADGE_HEIGHT_INCH * inch + y_spacing
-    rows_per_page = int((PAGE_HEIGHT - 2 * y_margin + y_spacing) // row_height)
-    badges_per_page = BADGES_PER_ROW * rows_per_page
-
-    for idx, attendee in enumerate(attendees):
-        badge_idx_on_page = idx % badges_per_page
-        col = badge_idx_on_page % BADGES_PER_ROW
-        row = badge_idx_on_page // BADGES_PER_ROW
-
-        # If first badge on a new page
-        if badge_idx_on_page == 0 and idx != 0:
-            c.showPage()
-
-        x = x_positions[col]
-        y = PAGE_HEIGHT - y_margin - (row + 1) * row_height + y_spacing
-
-        # Draw badge border
-        c.rect(x, y, BADGE_WIDTH_INCH * inch, BADGE_HEIGHT_INCH * inch)
-
-        # Text
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(x + 0.1 * inch, y + BADGE_HEIGHT_INCH * inch - 0.4 * inch, attendee['name'])
-
-        c.setFont("Helvetica", 10)
-        c.drawString(x + 0.1 * inch, y + BADGE_HEIGHT_INCH * inch - 0.7 * inch, attendee['email'])
-        c.drawString(x + 0.1 * inch, y + BADGE_HEIGHT_INCH * inch - 0.9 * inch, f"Badge #: {attendee['badge_id']}")
-
-        # QR code
-        qr_img = generate_qr_code_img(str(attendee['badge_id']))
-        qr_buffer = BytesIO()
-        qr_img.save(qr_buffer, format="PNG")
-        qr_buffer.seek(0)
-        img = Image.open(qr_buffer)
-
-        qr_x = x + BADGE_WIDTH_INCH * inch / 2 - 0.4 * inch
-        qr_y = y + 0.2 * inch
-        c.drawInlineImage(img, qr_x, qr_y, width=0.8 * inch, height=0.8 * inch)
-
-    c.save()
-    buffer.seek(0)
-    return buffer
-
-# Fetch attendees
-attendees = get_all_attendees()
-
-if st.button("Generate PDF of Badges"):
-    pdf_buffer = create_badge_pdf(attendees)
-    st.download_button(
-        label="📄 Download Conference Badges PDF",
-        data=pdf_buffer,
-        file_name="conference_badges.pdf",
-        mime="application/pdf"
-    )
-
+# Which badges to render
+mode = st.radio(
+    "Badges to print",
+    ["New or changed since last print", "All attendees", "Reprint selected badge IDs"],
+)
+if mode == "All attendees":
+    attendees = get_all_attendees(BADGE_COLUMNS)
+elif mode == "Reprint selected badge IDs":
+    raw_ids = st.text_input("Badge IDs (comma-separated)", placeholder="12, 40, 41")
+    badge_ids = [int(b) for b in raw_ids.replace(" ", "").split(",") if b.isdigit()]
+    attendees = get_attendees_by_ids(badge_ids) if badge_ids else []
+else:
+    attendees = get_unprinted_attendees()
+st.caption(f"{len(attendees)} badge(s) selected.")
+
+qr_mode = st.radio("QR codes", ["raster", "vector"], horizontal=True)
+col1, col2 = st.columns(2)
+per_row = col1.number_input("Badges per row", min_value=1, max_value=3, value=3)
+rows = col2.number_input("Rows per page", min_value=1, max_value=2, value=2)
+
+if st.button("Generate PDF of Badges", disabled=not attendees):
+    # replace this session's previous run, if any, and anything abandoned
+    old_path = st.session_state.pop("badge_pdf_path", None)
+    if old_path and os.path.exists(old_path):
+        os.remove(old_path)
+    os.makedirs(BADGE_PDF_DIR, exist_ok=True)
+    sweep_old_pdfs()
+
+    # rendered page-chunk by page-chunk straight to disk; CPU-bound chunks
+    # are split across processes
+    pdf_path = os.path.join(BADGE_PDF_DIR, f"{uuid.uuid4().hex}.pdf")
+    write_badge_pdf(attendees, pdf_path, workers=os.cpu_count() or 1, qr_mode=qr_mode,
+                    badges_per_row=int(per_row), rows_per_page=int(rows))
+    st.session_state["badge_pdf_path"] = pdf_path
+    # advance the printed watermark so the next "new" run skips these; badges
+    # edited since they were read stay listed
+    stamped = mark_badges_printed(attendees)
+    if stamped < len(attendees):
+        st.info(f"{len(attendees) - stamped} badge(s) changed while printing and "
+                f"stay in the 'new or changed' list.")
+
+pdf_path = st.session_state.get("badge_pdf_path")
+if pdf_path and os.path.exists(pdf_path):
+    if st.get_option("server.enableStaticServing"):
+        st.link_button("📄 Download Conference Badges PDF",
+                       f"app/static/badges/{os.path.basename(pdf_path)}")
+    else:
+        # Without static serving, Streamlit copies the whole PDF into its
+        # in-memory media store when the button is clicked (one copy per
+        # download, dropped with the session's media on its next run).
+        st.download_button(
+            label="📄 Download Conference Badges PDF",
+            data=lambda: read_pdf(pdf_path),
+            file_name="conference_badges.pdf",
+            mime="application/pdf",
+            on_click="ignore",
+        )
@@ -0,0 +1,149 @@
+# qr_cache.py
+"""
+Content-addressed QR code asset cache.
+
+Each QR image is keyed by a hash of its payload and render parameters and
+kept in two tiers: an in-process LRU (PNG bytes plus the decoded image) and
+PNG files under QR_CACHE_DIR. Module matrices for vector drawing are cached
+the same way. Callers get PNG bytes for st.image/downloads,
+or a ready-to-draw PIL image for ReportLab, without re-encoding either.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import qrcode
+from PIL import Image
+
+QR_CACHE_DIR = os.getenv(
+    "QR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".qr_cache"),
+)
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "4096"))
+
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+_lru: "OrderedDict[str, list]" = OrderedDict()  # key → [png bytes, PIL image or None]
+_matrix_lru: "OrderedDict[str, tuple]" = OrderedDict()  # key → module matrix
+_lru_lock = threading.Lock()
+
+
+def qr_key(payload, box_size=10, border=4, error_correction="M") -> str:
+    params = {"payload": str(payload), "box_size": box_size,
+              "border": border, "ec": error_correction}
+    blob = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def render_qr_png(payload, box_size=10, border=4, error_correction="M") -> bytes:
+    """Encode a QR code from scratch (the cache's miss path)."""
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECTION[error_correction],
+                       box_size=box_size, border=border)
+    qr.add_data(str(payload))
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(QR_CACHE_DIR, key[:2], f"{key}.png")
+
+
+def _remember(key: str, png: bytes, image=None) -> list:
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is None:
+            entry = _lru[key] = [png, image]
+        elif image is not None and entry[1] is None:
+            entry[1] = image
+        _lru.move_to_end(key)
+        while len(_lru) > QR_CACHE_SIZE:
+            _lru.popitem(last=False)
+        return entry
+
+
+def _lookup(key: str):
+    with _lru_lock:
+        entry = _lru.get(key)
+        if entry is not None:
+            _lru.move_to_end(key)
+        return entry
+
+
+def get_qr_png(payload, box_size=10, border=4, error_correction="M") -> bytes:
+    """PNG bytes for this QR code, from memory, disk, or a fresh render."""
+    key = qr_key(payload, box_size, border, error_correction)
+    entry = _lookup(key)
+    if entry is not None:
+        return entry[0]
+
+    path = _disk_path(key)
+    try:
+        with open(path, "rb") as f:
+            png = f.read()
+    except FileNotFoundError:
+        png = render_qr_png(payload, box_size, border, error_correction)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+    return _remember(key, png)[0]
+
+
+def get_qr_image(payload, box_size=10, border=4, error_correction="M"):
+    """Decoded PIL image for this QR code; decoded at most once per process."""
+    key = qr_key(payload, box_size, border, error_correction)
+    entry = _lookup(key)
+    if entry is not None and entry[1] is not None:
+        return entry[1]
+    png = get_qr_png(payload, box_size, border, error_correction)
+    image = Image.open(BytesIO(png))
+    image.load()
+    return _remember(key, png, image)[1]
+
+
+def get_qr_matrix(payload, border=4, error_correction="M") -> tuple:
+    """
+    The QR module matrix (tuple of row tuples of bools, border included),
+    for drawing codes as vectors. Cached in memory and on disk as rows of
+    0/1 characters.
+    """
+    key = qr_key(payload, None, border, error_correction)
+    with _lru_lock:
+        matrix = _matrix_lru.get(key)
+        if matrix is not None:
+            _matrix_lru.move_to_end(key)
+            return matrix
+
+    path = os.path.join(QR_CACHE_DIR, key[:2], f"{key}.qrm")
+    try:
+        with open(path, encoding="ascii") as f:
+            matrix = tuple(tuple(ch == "1" for ch in line.rstrip("\n")) for line in f)
+    except FileNotFoundError:
+        qr = qrcode.QRCode(error_correction=ERROR_CORRECTION[error_correction],
+                           border=border)
+        qr.add_data(str(payload))
+        qr.make(fit=True)
+        matrix = tuple(tuple(row) for row in qr.get_matrix())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="ascii") as f:
+            f.write("\n".join("".join("1" if m else "0" for m in row) for row in matrix))
+        os.replace(tmp, path)
+
+    with _lru_lock:
+        _matrix_lru[key] = matrix
+        while len(_matrix_lru) > QR_CACHE_SIZE:
+            _matrix_lru.popitem(last=False)
+    return matrix
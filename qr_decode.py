@@ -0,0 +1,166 @@
+# qr_decode.py
+"""
+QR decode pipeline for the check-in camera.
+
+Frames are converted to grayscale once and downscaled so their long side is
+at most QR_DECODE_MAX_SIDE pixels. Decoding runs in passes, stopping at the
+first that succeeds:
+
+  1. fast  – OpenCV's QRCodeDetector on the downscaled frame
+  2. zbar  – pyzbar on the same frame, if pyzbar and libzbar are installed
+  3. otsu  – OpenCV again on a contrast-stretched, Otsu-binarized frame
+  4. full  – OpenCV on the native-resolution frame, only if it was downscaled
+
+Each thread reuses one cv2.QRCodeDetector; detectors are not thread-safe,
+and Streamlit runs every session on its own thread.
+"""
+import os
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image
+
+try:
+    from pyzbar import pyzbar
+except ImportError:  # pyzbar not installed, or libzbar missing
+    pyzbar = None
+
+QR_DECODE_MAX_SIDE = int(os.getenv("QR_DECODE_MAX_SIDE", "1024"))
+# group photos carry several small codes, so they keep more resolution
+QR_GROUP_MAX_SIDE = int(os.getenv("QR_GROUP_MAX_SIDE", "2048"))
+QR_GROUP_MAX_CODES = int(os.getenv("QR_GROUP_MAX_CODES", "20"))
+
+_local = threading.local()
+
+
+def get_detector() -> cv2.QRCodeDetector:
+    """This thread's shared QRCodeDetector."""
+    detector = getattr(_local, "detector", None)
+    if detector is None:
+        detector = _local.detector = cv2.QRCodeDetector()
+    return detector
+
+
+def to_gray(image) -> np.ndarray:
+    """
+    A grayscale uint8 array from a PIL image, an RGB/gray array or a
+    file-like object (e.g. st.camera_input).
+    """
+    if not isinstance(image, (Image.Image, np.ndarray)):
+        image = Image.open(image)
+    if isinstance(image, Image.Image):
+        gray = np.asarray(image.convert("L"))
+    elif image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = image
+    return gray
+
+
+def downscale(gray, max_side=QR_DECODE_MAX_SIDE) -> np.ndarray:
+    longest = max(gray.shape[:2])
+    if max_side and longest > max_side:
+        scale = max_side / longest
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def _decode_fast(gray):
+    data, _, _ = get_detector().detectAndDecode(gray)
+    return data or None
+
+
+def _decode_zbar(gray):
+    if pyzbar is None:
+        return None
+    for symbol in pyzbar.decode(gray, symbols=[pyzbar.ZBarSymbol.QRCODE]):
+        return symbol.data.decode("utf-8")
+    return None
+
+
+def _binarize(gray):
+    stretched = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX)
+    _, binary = cv2.threshold(stretched, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def _decode_otsu(gray):
+    return _decode_fast(_binarize(gray))
+
+
+PASSES = (("fast", _decode_fast), ("zbar", _decode_zbar), ("otsu", _decode_otsu))
+
+
+def decode_qr(image, max_side=QR_DECODE_MAX_SIDE):
+    """
+    Decode one QR code from a camera frame. Returns (payload, pass name),
+    or (None, None) if no pass could read it.
+    """
+    full = to_gray(image)
+    gray = downscale(full, max_side)
+    for name, decode in PASSES:
+        data = decode(gray)
+        if data:
+            return data.strip(), name
+    if gray is not full:
+        data = _decode_fast(full)
+        if data:
+            return data.strip(), "full"
+    return None, None
+
+
+def _decode_many_cv2(gray, limit=QR_GROUP_MAX_CODES):
+    """
+    detectAndDecodeMulti, then a sweep for codes it skipped: each located
+    code is painted over and the single-code detector is run again on what
+    is left, until nothing more is found. The sweep runs at most `limit`
+    times, so a code that is located but never decodes (or a mask that
+    doesn't cover it) can't keep it going.
+    """
+    detector = get_detector()
+    ok, data, points, _ = detector.detectAndDecodeMulti(gray)
+    found = [d for d in data if d] if ok else []
+    masked = gray.copy()
+    for quad in (points if ok and points is not None else []):
+        cv2.fillConvexPoly(masked, quad.astype(np.int32), 255)
+    for _ in range(limit):
+        if len(found) >= limit:
+            break
+        data, quad, _ = detector.detectAndDecode(masked)
+        if quad is None:
+            break
+        if data:
+            found.append(data)
+        cv2.fillConvexPoly(masked, quad.reshape(-1, 2).astype(np.int32), 255)
+    return found
+
+
+def _decode_many_zbar(gray):
+    if pyzbar is None:
+        return []
+    return [s.data.decode("utf-8")
+            for s in pyzbar.decode(gray, symbols=[pyzbar.ZBarSymbol.QRCODE])]
+
+
+def decode_all_qr(image, max_side=QR_GROUP_MAX_SIDE) -> list[str]:
+    """
+    Every distinct QR payload in one frame (e.g. a group of badges held up
+    together), in first-detected order. OpenCV's multi-code detector and
+    pyzbar (if available) each read the frame and their results are merged;
+    the Otsu-binarized frame is tried only if neither found anything.
+    At most QR_GROUP_MAX_CODES payloads are returned per frame.
+    """
+    gray = downscale(to_gray(image), max_side)
+    found = _decode_many_cv2(gray) + _decode_many_zbar(gray)
+    if not found:
+        found = _decode_many_cv2(_binarize(gray))
+    return list(dict.fromkeys(d.strip() for d in found))[:QR_GROUP_MAX_CODES]
+
+
+def parse_badge_id(payload):
+    """The badge id in a QR payload ("42" or "042"), or None."""
+    try:
+        return int(payload)
+    except (TypeError, ValueError):
+        return None
@@ -1,15 +1,172 @@
-import qrcode
+# qrcodegenerator.py
+"""
+Pre-generate badge QR code images.
+
+    python qrcodegenerator.py                       # badges 01–88 → qr_codes/
+    python qrcodegenerator.py --range 1-20000 --workers 8
+    python qrcodegenerator.py --from-csv attendees_with_scans.csv
+    python qrcodegenerator.py --range 1-500 --zip qr_codes.zip
+    python qrcodegenerator.py --range 1-500 --sprite qr_sprite.png
+
+Images are rendered in a process pool. A manifest in the output folder
+records the cache key and checksum of every file written, so re-running
+(e.g. after an interruption) skips files that already exist unchanged.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
 import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from qr_cache import qr_key, render_qr_png
+
+MANIFEST = ".manifest.json"
+# same defaults as qrcode.make()
+QR_PARAMS = {"box_size": 10, "border": 4, "error_correction": "M"}
+
+
+def parse_range(spec: str) -> list[int]:
+    """'1-88' or '1-10,40,50-60' → sorted badge ids."""
+    ids = set()
+    for part in spec.split(","):
+        lo, _, hi = part.strip().partition("-")
+        ids.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(ids)
+
+
+def read_badge_ids(path: str) -> list[int]:
+    """Badge ids from an attendee export (a 'badge_id' or 'Badge ID' column)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        col = next(c for c in reader.fieldnames if c.lower().replace(" ", "_") == "badge_id")
+        return sorted({int(row[col]) for row in reader if row[col].strip()})
+
+
+def _render(payload: str):
+    png = render_qr_png(payload, **QR_PARAMS)
+    return payload, png, hashlib.sha256(png).hexdigest()
+
+
+def _write_file(args):
+    payload, path = args
+    payload, png, digest = _render(payload)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(png)
+    os.replace(tmp, path)
+    return payload, digest
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_manifest(folder: str) -> dict:
+    try:
+        with open(os.path.join(folder, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_manifest(folder: str, manifest: dict):
+    path = os.path.join(folder, MANIFEST)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def write_folder(payloads, folder, workers):
+    """Write qr_<payload>.png files, skipping ones already present and unchanged."""
+    os.makedirs(folder, exist_ok=True)
+    manifest = _load_manifest(folder)
+
+    todo = []
+    for payload in payloads:
+        name = f"qr_{payload}.png"
+        path = os.path.join(folder, name)
+        entry = manifest.get(name)
+        if (entry and entry["key"] == qr_key(payload, **QR_PARAMS)
+                and os.path.exists(path) and _sha256(path) == entry["sha256"]):
+            continue
+        todo.append((payload, path))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, (payload, digest) in enumerate(
+                pool.map(_write_file, todo, chunksize=64), start=1):
+            manifest[f"qr_{payload}.png"] = {"key": qr_key(payload, **QR_PARAMS),
+                                             "sha256": digest}
+            # checkpoint so an interrupted run resumes where it stopped
+            if done % 1000 == 0:
+                _save_manifest(folder, manifest)
+    _save_manifest(folder, manifest)
+    return len(todo), len(payloads) - len(todo)
+
+
+def write_zip(payloads, path, workers):
+    """Write every image into a single zip (PNGs are stored, not recompressed)."""
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            zipfile.ZipFile(f"{path}.tmp", "w", zipfile.ZIP_STORED) as zf:
+        for payload, png, _ in pool.map(_render, payloads, chunksize=64):
+            zf.writestr(f"qr_{payload}.png", png)
+    os.replace(f"{path}.tmp", path)
+
+
+def write_sprite(payloads, path, workers, columns):
+    """
+    Write one sprite sheet PNG plus <path>.json mapping each payload to its
+    [x, y, width, height] cell.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        images = [(payload, Image.open(io.BytesIO(png)))
+                  for payload, png, _ in pool.map(_render, payloads, chunksize=64)]
+    cell = max(max(img.size) for _, img in images)
+    rows = -(-len(images) // columns)
+    sheet = Image.new("1", (columns * cell, rows * cell), 1)
+    index = {}
+    for i, (payload, img) in enumerate(images):
+        x, y = (i % columns) * cell, (i // columns) * cell
+        sheet.paste(img, (x, y))
+        index[payload] = [x, y, img.size[0], img.size[1]]
+    sheet.save(path, optimize=True)
+    with open(f"{os.path.splitext(path)[0]}.json", "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pre-generate badge QR code images.")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--range", default="1-88", help="badge ids, e.g. 1-88 or 1-10,40-60")
+    src.add_argument("--from-csv", help="attendee export with a badge_id column")
+    ap.add_argument("--pad", type=int, default=2, help="zero-pad payloads to this width")
+    ap.add_argument("--out", default="qr_codes", help="output folder")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    bundle = ap.add_mutually_exclusive_group()
+    bundle.add_argument("--zip", help="write a single zip instead of a folder")
+    bundle.add_argument("--sprite", help="write a single sprite sheet PNG instead")
+    ap.add_argument("--columns", type=int, default=50, help="sprite sheet columns")
+    args = ap.parse_args()
+
+    ids = read_badge_ids(args.from_csv) if args.from_csv else parse_range(args.range)
+    payloads = [f"{i:0{args.pad}d}" for i in ids]  # zero-padded: 01, 02, ...
 
-# Create output folder if it doesn't exist
-output_folder = "qr_codes"
-os.makedirs(output_folder, exist_ok=True)
+    if args.zip:
+        write_zip(payloads, args.zip, args.workers)
+        print(f"✅ Done! Saved {len(payloads)} QR codes to '{args.zip}'.")
+    elif args.sprite:
+        write_sprite(payloads, args.sprite, args.workers, args.columns)
+        print(f"✅ Done! Saved {len(payloads)} QR codes to sprite '{args.sprite}'.")
+    else:
+        written, skipped = write_folder(payloads, args.out, args.workers)
+        print(f"✅ Done! Saved {written} QR codes in the '{args.out}' folder "
+              f"({skipped} already up to date).")
 
-# Generate QR codes for badge IDs 01 to 88
-for i in range(1, 89):
-    badge_id = f"{i:02d}"  # zero-padded: 01, 02, ..., 88
-    img = qrcode.make(badge_id)
-    img_path = os.path.join(output_folder, f"qr_{badge_id}.png")
-    img.save(img_path)
 
-print(f"✅ Done! Saved 88 QR codes in the '{output_folder}' folder.")
+if __name__ == "__main__":
+    main()
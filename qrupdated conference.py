@@ -8,15 +8,15 @@ import os
 from io import BytesIO
 from PIL import Image
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from supabase_client import get_client
 from database import get_all_attendees, log_scan
+from schedule import get_schedule
+from qr_decode import decode_qr
 from database import get_scan_log
 
-# ─── Load .env & initialize Supabase client ───────────────────────────────
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# ─── Shared Supabase client (one per process; see supabase_client.py) ─────
+supabase: Client = get_client()
 
 from database import (
     register_attendee,
@@ -33,24 +33,9 @@ def switch_page(page_name: str):
 # ─── Init page state ────────────────────────────────────────────────────────
 if 'page' not in st.session_state:
     st.session_state.page = 'home'
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Conference session definitions with titles and exact times
-conference_sessions = [
-    {"title": "Prevention of C.M.", "start": "2025-05-02 08:30", "end": "2025-05-02 10:00"},
-    {"title": "The TDCJ SO Treatment Program", "start": "2025-05-02 10:30", "end": "2025-05-02 12:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 1)", "start": "2025-05-02 13:30", "end": "2025-05-02 15:00"},
-    {"title": "Taking the High Road - Ethical Challenges (Part 2)", "start": "2025-05-02 15:30", "end": "2025-05-02 17:00"},
-    {"title": "Use of Polygraph Exams in Treatment", "start": "2025-05-03 08:30", "end": "2025-05-03 10:00"},
-    {"title": "Challenges, Lessons Learned...", "start": "2025-05-03 10:30", "end": "2025-05-03 12:00"},
-    {"title": "Treating Clients with Mild Autism", "start": "2025-05-03 13:30", "end": "2025-05-03 15:00"},
-    {"title": "Unpacking the Offense Cycle", "start": "2025-05-03 15:30", "end": "2025-05-03 17:00"},
-    {"title": "Risk Assessment Reports", "start": "2025-05-04 08:30", "end": "2025-05-04 10:00"},
-    {"title": "Chaperon Training", "start": "2025-05-04 10:30", "end": "2025-05-04 12:00"},
-    {"title": "Legal and Strategy Aspects of Deregistration", "start": "2025-05-04 13:30", "end": "2025-05-04 15:00"},
-    {"title": "RNR Approach to Adolescent Assessment", "start": "2025-05-04 15:30", "end": "2025-05-04 17:00"},
-]
+conference_sessions = get_schedule().as_dicts()  # shared registry, see schedule.py
 
 
 
@@ -74,9 +59,7 @@ def run_qr_scanner():
     if not img_file:
         return
 
-    img = Image.open(img_file).convert("RGB")
-    gray = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2GRAY)
-    data, _, _ = cv2.QRCodeDetector().detectAndDecode(gray)
+    data, _ = decode_qr(img_file)
     if not data:
         st.warning("⚠ QR Code not recognized.")
         return
@@ -336,9 +319,6 @@ elif st.session_state.page == 'admin':
 )
 
 
-# — your usual init —
-load_dotenv()
-supabase = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
 
 def get_next_badge_id():
     # pull the single highest badge_id, descending, limit=1
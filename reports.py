@@ -0,0 +1,155 @@
+# reports.py
+"""
+Report builders that work on already-fetched rows, with no Supabase or
+Streamlit dependency, so they can be benchmarked and reused outside the app.
+"""
+import datetime
+import numpy as np
+import pandas as pd
+
+LOCAL_TZ = "America/Chicago"
+SESSION_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def parse_sessions(sessions):
+    """
+    Parse session dicts ({'title','start','end'}) once into
+    (titles, starts, ends), with starts/ends as datetime64 arrays.
+    """
+    titles = [s["title"] for s in sessions]
+    starts = np.array(
+        [datetime.datetime.strptime(s["start"], SESSION_TIME_FORMAT) for s in sessions],
+        dtype="datetime64[ns]",
+    )
+    ends = np.array(
+        [datetime.datetime.strptime(s["end"], SESSION_TIME_FORMAT) for s in sessions],
+        dtype="datetime64[ns]",
+    )
+    return titles, starts, ends
+
+
+def _local_naive(timestamps) -> np.ndarray:
+    """
+    Scan timestamps as naive conference-local datetime64s, comparable with
+    the naive session times. Aware values (what Supabase returns) are
+    converted to LOCAL_TZ first.
+    """
+    first = timestamps[0]
+    if isinstance(first, str) or getattr(first, "tzinfo", None) is not None:
+        idx = pd.to_datetime(timestamps, utc=True).tz_convert(LOCAL_TZ).tz_localize(None)
+    else:
+        idx = pd.to_datetime(timestamps)
+    return idx.values.astype("datetime64[ns]")
+
+
+def ce_report_frame(logs, sessions, parsed=None) -> pd.DataFrame:
+    """
+    Mark ✅ for each attendee who scanned during each session window.
+
+    logs     – list of {badge_id, name, email, timestamp}
+    sessions – list of {'title','start','end'} dicts
+    parsed   – optional parse_sessions(sessions) result, to skip re-parsing
+
+    Scans are sorted once; each session's window is then located with two
+    binary searches, so matching costs O((scans + sessions) log scans)
+    rather than O(scans × sessions). Overlapping sessions (multiple tracks)
+    are handled naturally. Rows appear in first-seen order, one per badge:
+      Badge ID | Name | Email | [session1] | [session2] | ...
+    """
+    titles, starts, ends = parsed if parsed is not None else parse_sessions(sessions)
+    if not logs:
+        return pd.DataFrame(columns=["Badge ID", "Name", "Email", *titles])
+
+    bids = np.fromiter((l["badge_id"] for l in logs), dtype=np.int64, count=len(logs))
+    times = _local_naive([l["timestamp"] for l in logs])
+
+    # one row per badge, in order of first appearance
+    codes, uniques = pd.factorize(bids)
+    _, first = np.unique(codes, return_index=True)
+
+    # scans in each session window = a contiguous slice of the sorted times
+    order = np.argsort(times, kind="stable")
+    sorted_times = times[order]
+    lo = np.searchsorted(sorted_times, starts, side="left")
+    hi = np.searchsorted(sorted_times, ends, side="right")
+    lens = np.maximum(hi - lo, 0)
+
+    # expand every (lo, hi) slice into flat (scan position, session) pairs
+    sess_idx = np.repeat(np.arange(len(titles)), lens)
+    slice_base = np.repeat(lo - np.concatenate(([0], np.cumsum(lens)[:-1])), lens)
+    scan_pos = slice_base + np.arange(lens.sum())
+
+    attended = np.zeros((len(uniques), len(titles)), dtype=bool)
+    attended[codes[order[scan_pos]], sess_idx] = True
+
+    df = pd.DataFrame({
+        "Badge ID": uniques,
+        "Name":     [logs[i]["name"] for i in first],
+        "Email":    [logs[i]["email"] for i in first],
+    })
+    marks = pd.DataFrame(np.where(attended, "✅", ""), columns=titles)
+    return pd.concat([df, marks], axis=1)
+
+
+def ce_report_from_attendance(rows, sessions, scanned=()) -> pd.DataFrame:
+    """
+    Same wide frame as ce_report_frame, built from session_attendance rows
+    ({badge_id, session_id, name, email}) instead of raw scans. `sessions`
+    are schedule.Session objects; rows are returned in badge order.
+
+    scanned – optional {badge_id, name, email} for every badge that scanned
+              during the report's window; those that matched no session
+              still get a row, with no marks, as ce_report_frame gives them
+    """
+    titles = [s.title for s in sessions]
+    col_of = {s.id: j for j, s in enumerate(sessions)}
+    rows = [r for r in rows if r["session_id"] in col_of]
+    rows += [{**r, "session_id": None} for r in scanned]
+    if not rows:
+        return pd.DataFrame(columns=["Badge ID", "Name", "Email", *titles])
+
+    bids = np.fromiter((r["badge_id"] for r in rows), dtype=np.int64, count=len(rows))
+    uniques, first, codes = np.unique(bids, return_index=True, return_inverse=True)
+    attended = np.zeros((len(uniques), len(titles)), dtype=bool)
+    hits = [i for i, r in enumerate(rows) if r["session_id"] is not None]
+    cols = np.fromiter((col_of[rows[i]["session_id"]] for i in hits), dtype=np.intp,
+                       count=len(hits))
+    attended[codes[hits], cols] = True
+
+    df = pd.DataFrame({
+        "Badge ID": uniques,
+        "Name":     [rows[i]["name"] for i in first],
+        "Email":    [rows[i]["email"] for i in first],
+    })
+    marks = pd.DataFrame(np.where(attended, "✅", ""), columns=titles)
+    return pd.concat([df, marks], axis=1)
+
+
+def flattened_log(raw_scans, attendee_map, max_scans=10) -> pd.DataFrame:
+    """
+    One row per scanned badge, sorted by badge, with its earliest scans
+    spread across columns:
+      Badge ID | Name | Email | Scan 1 | ... | Scan 10
+
+    raw_scans    – list of {badge_id, timestamp} (timestamps as datetimes)
+    attendee_map – {badge_id: {name, email}}; unregistered badges are labelled
+    """
+    # group scans by badge_id (earliest → latest)
+    scans_by = {}
+    for entry in sorted(raw_scans, key=lambda x: x["timestamp"]):
+        bid = int(entry["badge_id"])
+        scans_by.setdefault(bid, []).append(entry["timestamp"])
+
+    rows = []
+    for bid in sorted(scans_by):
+        times = scans_by[bid]
+        info = attendee_map.get(bid, {})
+        row = {
+            "Badge ID": bid,
+            "Name":     info.get("name", f"<unregistered {bid}>"),
+            "Email":    info.get("email", ""),
+        }
+        for i in range(max_scans):
+            row[f"Scan {i + 1}"] = times[i].strftime("%Y-%m-%d %H:%M:%S") if i < len(times) else ""
+        rows.append(row)
+    return pd.DataFrame(rows)
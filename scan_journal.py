@@ -0,0 +1,124 @@
+# scan_journal.py
+"""
+Offline-first local scan journal.
+
+Scans are appended to a SQLite database in WAL mode and get a durable local
+id plus a client UUID straight away, so check-in never waits on the network.
+A background sync worker replays unsynced rows in batches through a caller
+supplied `write` function (database._write_scans) and marks them synced once
+the backend has acknowledged them.
+
+`synced` holds the time a row was acknowledged (0 while pending). Synced rows
+are kept for `retention` seconds, so a replay of the same client_id is still
+ignored, then deleted; the journal stays at roughly one window's worth of
+scans however long the event runs.
+"""
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class ScanJournal:
+    def __init__(self, path: str, retention: float = 3600):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scans (
+                id        INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_id TEXT    NOT NULL UNIQUE,
+                badge_id  INTEGER NOT NULL,
+                timestamp TEXT    NOT NULL,
+                synced    INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS scans_pending ON scans (synced, id)"
+        )
+
+    def append(self, badge_id: int, timestamp: str, client_id: str = None) -> str:
+        """
+        Durably record one scan and return its client UUID. Pass the scan's
+        existing client_id, if it has one, so replays stay idempotent.
+        """
+        client_id = client_id or str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO scans (client_id, badge_id, timestamp) VALUES (?, ?, ?)",
+                (client_id, int(badge_id), timestamp),
+            )
+        return client_id
+
+    def pending(self, limit: int = 100) -> list[dict]:
+        """Oldest unsynced scans, as dicts ready for check_in_many."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, client_id, badge_id, timestamp FROM scans "
+                "WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"id": r[0], "client_id": r[1], "badge_id": r[2], "timestamp": r[3]}
+            for r in rows
+        ]
+
+    def mark_synced(self, ids: list[int]):
+        """Mark rows acknowledged, and drop synced rows past the retention window."""
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE scans SET synced = ? WHERE id = ?", [(now, i) for i in ids]
+            )
+            # rows synced before this change hold 1, so they go on the first pass
+            self._conn.execute(
+                "DELETE FROM scans WHERE synced > 0 AND synced < ?",
+                (now - self.retention,),
+            )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM scans WHERE synced = 0"
+            ).fetchone()[0]
+
+    def sync_once(self, write, batch_size: int = 100) -> int:
+        """Replay pending scans until the journal is drained. Returns the count."""
+        synced = 0
+        while True:
+            batch = self.pending(batch_size)
+            if not batch:
+                return synced
+            write([{k: r[k] for k in ("client_id", "badge_id", "timestamp")}
+                   for r in batch])
+            self.mark_synced([r["id"] for r in batch])
+            synced += len(batch)
+
+    def start_sync_worker(self, write, interval: float = 2.0,
+                          batch_size: int = 100) -> threading.Thread:
+        """
+        Run sync_once every `interval` seconds on a daemon thread. Failures
+        (backend unreachable, timeouts) leave the rows pending for next time.
+        """
+        stop = threading.Event()
+
+        def loop():
+            while not stop.is_set():
+                try:
+                    self.sync_once(write, batch_size)
+                except Exception as e:
+                    print(f"Scan journal sync failed "
+                          f"({self.pending_count()} pending): {e}")
+                stop.wait(interval)
+
+        worker = threading.Thread(target=loop, name="scan-journal-sync",
+                                  daemon=True)
+        worker.stop = stop
+        worker.start()
+        return worker
@@ -0,0 +1,135 @@
+# schedule.py
+"""
+Conference schedule registry.
+
+Sessions are loaded once, from the `sessions` table (SCHEDULE_SOURCE=db) or
+from a JSON file (default sessions.json), and kept as typed, sorted
+intervals. Every consumer — the check-in page, the CE report and the admin
+date picker — shares the same pre-parsed Schedule from get_schedule();
+reload_schedule() swaps in a fresh copy without restarting the app.
+
+Session times are naive conference-local datetimes.
+"""
+import datetime
+import json
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+SCHEDULE_SOURCE = os.getenv(
+    "SCHEDULE_SOURCE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions.json"),
+)
+SESSION_TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class Session(NamedTuple):
+    id: int
+    title: str
+    start: datetime.datetime
+    end: datetime.datetime
+
+    def as_dict(self) -> dict:
+        """The legacy {'title','start','end'} string form."""
+        return {
+            "title": self.title,
+            "start": self.start.strftime(SESSION_TIME_FORMAT),
+            "end":   self.end.strftime(SESSION_TIME_FORMAT),
+        }
+
+
+class Schedule:
+    def __init__(self, sessions):
+        self.sessions = sorted(sessions, key=lambda s: (s.start, s.end, s.id))
+        self.titles = [s.title for s in self.sessions]
+        self.starts = np.array([s.start for s in self.sessions], dtype="datetime64[ns]")
+        self.ends = np.array([s.end for s in self.sessions], dtype="datetime64[ns]")
+        # longest session bounds how far back a stabbing query has to look
+        self._max_span = (self.ends - self.starts).max() if self.sessions else np.timedelta64(0)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __iter__(self):
+        return iter(self.sessions)
+
+    @property
+    def parsed(self):
+        """(titles, starts, ends), as reports.parse_sessions returns."""
+        return self.titles, self.starts, self.ends
+
+    def at(self, t: datetime.datetime) -> list[Session]:
+        """Sessions whose [start, end] window contains t."""
+        t = np.datetime64(t, "ns")
+        hi = np.searchsorted(self.starts, t, side="right")
+        lo = np.searchsorted(self.starts, t - self._max_span, side="left")
+        return [self.sessions[i] for i in range(lo, hi) if self.ends[i] >= t]
+
+    def for_date(self, d: datetime.date) -> "Schedule":
+        """The sessions starting on date d, as their own Schedule."""
+        day = np.datetime64(d, "ns")
+        lo = np.searchsorted(self.starts, day, side="left")
+        hi = np.searchsorted(self.starts, day + np.timedelta64(1, "D"), side="left")
+        return Schedule(self.sessions[lo:hi])
+
+    def dates(self) -> list[datetime.date]:
+        return sorted({s.start.date() for s in self.sessions})
+
+    def as_dicts(self) -> list[dict]:
+        return [s.as_dict() for s in self.sessions]
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.strptime(value, SESSION_TIME_FORMAT)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+
+
+def load_schedule_file(path: str) -> Schedule:
+    """Load [{id, title, start, end}, ...] from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    return Schedule(
+        Session(int(r.get("id", i + 1)), r["title"],
+                _parse_time(r["start"]), _parse_time(r["end"]))
+        for i, r in enumerate(rows)
+    )
+
+
+def load_schedule_db() -> Schedule:
+    """Load the `sessions` table (see sql/005_sessions.sql)."""
+    from supabase_client import get_client
+
+    rows = get_client().table("sessions") \
+                       .select("id,title,starts_at,ends_at") \
+                       .order("starts_at") \
+                       .execute().data or []
+    return Schedule(
+        Session(int(r["id"]), r["title"],
+                _parse_time(r["starts_at"]), _parse_time(r["ends_at"]))
+        for r in rows
+    )
+
+
+_schedule: Schedule | None = None
+_schedule_lock = threading.Lock()
+
+
+def reload_schedule(source: str = None) -> Schedule:
+    """(Re)load the schedule from `source` ("db" or a JSON path)."""
+    global _schedule
+    source = source or SCHEDULE_SOURCE
+    schedule = load_schedule_db() if source == "db" else load_schedule_file(source)
+    with _schedule_lock:
+        _schedule = schedule
+    return schedule
+
+
+def get_schedule() -> Schedule:
+    """The shared, pre-parsed schedule, loaded on first use."""
+    if _schedule is None:
+        return reload_schedule()
+    return _schedule
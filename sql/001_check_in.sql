@@ -0,0 +1,46 @@
+-- check_in: record one badge scan in a single round trip.
+--
+-- Inserts the raw event into scanlog, then fills the attendee's next empty
+-- scan1..scan10 column. The attendee row is locked for the duration so two
+-- kiosks scanning the same badge at once can't claim the same slot.
+-- Returns the attendee's name, or NULL for an unregistered badge.
+--
+-- Called from database.log_scan via supabase.rpc("check_in", ...).
+
+create or replace function public.check_in(
+    p_badge_id bigint,
+    p_ts       timestamptz default now()
+)
+returns text
+language plpgsql
+as $$
+declare
+    v_name  text;
+    v_slots timestamptz[];
+    v_slot  int;
+begin
+    insert into scanlog (badge_id, "timestamp")
+    values (p_badge_id, p_ts);
+
+    select name,
+           array[scan1, scan2, scan3, scan4, scan5,
+                 scan6, scan7, scan8, scan9, scan10]::timestamptz[]
+      into v_name, v_slots
+      from attendees
+     where badge_id = p_badge_id
+       for update;
+
+    if not found then
+        return null;
+    end if;
+
+    v_slot := array_position(v_slots, null);
+    if v_slot is not null then
+        execute format('update attendees set %I = $1 where badge_id = $2',
+                       'scan' || v_slot)
+          using p_ts, p_badge_id;
+    end if;
+
+    return v_name;
+end;
+$$;
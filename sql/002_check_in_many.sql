@@ -0,0 +1,82 @@
+-- check_in_many: bulk form of check_in for the write-behind scan buffer.
+--
+-- Takes a JSON array of {"badge_id": ..., "timestamp": ...} objects, inserts
+-- them into scanlog in one statement, then fills scan slots in timestamp
+-- order. check_in is redefined on top of the shared fill_scan_slot helper so
+-- both paths claim slots the same way.
+--
+-- Called from database._write_scans via supabase.rpc("check_in_many", ...).
+
+create or replace function public.fill_scan_slot(
+    p_badge_id bigint,
+    p_ts       timestamptz
+)
+returns text
+language plpgsql
+as $$
+declare
+    v_name  text;
+    v_slots timestamptz[];
+    v_slot  int;
+begin
+    select name,
+           array[scan1, scan2, scan3, scan4, scan5,
+                 scan6, scan7, scan8, scan9, scan10]::timestamptz[]
+      into v_name, v_slots
+      from attendees
+     where badge_id = p_badge_id
+       for update;
+
+    if not found then
+        return null;
+    end if;
+
+    v_slot := array_position(v_slots, null);
+    if v_slot is not null then
+        execute format('update attendees set %I = $1 where badge_id = $2',
+                       'scan' || v_slot)
+          using p_ts, p_badge_id;
+    end if;
+
+    return v_name;
+end;
+$$;
+
+create or replace function public.check_in(
+    p_badge_id bigint,
+    p_ts       timestamptz default now()
+)
+returns text
+language plpgsql
+as $$
+begin
+    insert into scanlog (badge_id, "timestamp")
+    values (p_badge_id, p_ts);
+
+    return public.fill_scan_slot(p_badge_id, p_ts);
+end;
+$$;
+
+create or replace function public.check_in_many(p_scans jsonb)
+returns table (badge_id bigint, name text)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+    r record;
+begin
+    insert into scanlog (badge_id, "timestamp")
+    select s.badge_id, s."timestamp"
+      from jsonb_to_recordset(p_scans) as s(badge_id bigint, "timestamp" timestamptz);
+
+    for r in
+        select s.badge_id, s."timestamp"
+          from jsonb_to_recordset(p_scans) as s(badge_id bigint, "timestamp" timestamptz)
+         order by s."timestamp"
+    loop
+        badge_id := r.badge_id;
+        name     := public.fill_scan_slot(r.badge_id, r."timestamp");
+        return next;
+    end loop;
+end;
+$$;
@@ -0,0 +1,41 @@
+-- Idempotent replays for the offline scan journal.
+--
+-- Every scan queued or journaled on a kiosk carries a client-generated UUID.
+-- A unique index on it lets check_in_many skip scans that already reached
+-- the database (e.g. a batch that succeeded but whose ack was lost), so a
+-- replay never inserts a scan twice or burns a second scan slot.
+
+alter table scanlog add column if not exists client_id uuid;
+create unique index if not exists scanlog_client_id_key on scanlog (client_id);
+
+create or replace function public.check_in_many(p_scans jsonb)
+returns table (badge_id bigint, name text)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+    v_new jsonb;
+    r     record;
+begin
+    with ins as (
+        insert into scanlog (badge_id, "timestamp", client_id)
+        select s.badge_id, s."timestamp", s.client_id
+          from jsonb_to_recordset(p_scans)
+               as s(badge_id bigint, "timestamp" timestamptz, client_id uuid)
+        on conflict (client_id) do nothing
+        returning scanlog.badge_id, scanlog."timestamp"
+    )
+    select coalesce(jsonb_agg(to_jsonb(ins) order by ins."timestamp"), '[]'::jsonb)
+      into v_new
+      from ins;
+
+    for r in
+        select s.badge_id, s."timestamp"
+          from jsonb_to_recordset(v_new) as s(badge_id bigint, "timestamp" timestamptz)
+    loop
+        badge_id := r.badge_id;
+        name     := public.fill_scan_slot(r.badge_id, r."timestamp");
+        return next;
+    end loop;
+end;
+$$;
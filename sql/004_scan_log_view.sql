@@ -0,0 +1,17 @@
+-- scan_log_view: scanlog joined to attendees on the server.
+--
+-- database.query_scan_log selects from this view with time-range, badge and
+-- paging filters, so callers receive only the rows and columns they need
+-- instead of stitching two full-table downloads together in Python.
+
+create or replace view public.scan_log_view as
+select s.id,
+       s.badge_id,
+       s."timestamp",
+       coalesce(a.name,  '') as name,
+       coalesce(a.email, '') as email
+  from scanlog s
+  left join attendees a on a.badge_id = s.badge_id;
+
+create index if not exists scanlog_timestamp_idx on scanlog ("timestamp");
+create index if not exists scanlog_badge_ts_idx  on scanlog (badge_id, "timestamp");
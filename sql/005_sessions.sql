@@ -0,0 +1,30 @@
+-- sessions: the conference schedule, read by schedule.load_schedule_db.
+--
+-- Times are conference-local (America/Chicago), stored without a zone to
+-- match how sessions have always been written in the app. Set
+-- SCHEDULE_SOURCE=db to load from this table instead of sessions.json.
+
+create table if not exists public.sessions (
+    id        bigint generated by default as identity primary key,
+    title     text      not null,
+    starts_at timestamp not null,
+    ends_at   timestamp not null,
+    check (ends_at > starts_at)
+);
+
+create index if not exists sessions_starts_at_idx on public.sessions (starts_at);
+
+insert into public.sessions (id, title, starts_at, ends_at) values
+    (1, 'Prevention of C.M.', '2025-05-02 08:30', '2025-05-02 10:00'),
+    (2, 'The TDCJ SO Treatment Program', '2025-05-02 10:30', '2025-05-02 12:00'),
+    (3, 'Taking the High Road - Ethical Challenges (Part 1)', '2025-05-02 13:30', '2025-05-02 15:00'),
+    (4, 'Taking the High Road - Ethical Challenges (Part 2)', '2025-05-02 15:30', '2025-05-02 17:00'),
+    (5, 'Use of Polygraph Exams in Treatment', '2025-05-03 08:30', '2025-05-03 10:00'),
+    (6, 'Challenges, Lessons Learned...', '2025-05-03 10:30', '2025-05-03 12:00'),
+    (7, 'Treating Clients with Mild Autism', '2025-05-03 13:30', '2025-05-03 15:00'),
+    (8, 'Unpacking the Offense Cycle', '2025-05-03 15:30', '2025-05-03 17:00'),
+    (9, 'Risk Assessment Reports', '2025-05-04 08:30', '2025-05-04 10:00'),
+    (10, 'Chaperon Training', '2025-05-04 10:30', '2025-05-04 12:00'),
+    (11, 'Legal and Strategy Aspects of Deregistration', '2025-05-04 13:30', '2025-05-04 15:00'),
+    (12, 'RNR Approach to Adolescent Assessment', '2025-05-04 15:30', '2025-05-04 17:00')
+on conflict (id) do nothing;
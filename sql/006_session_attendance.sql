@@ -0,0 +1,77 @@
+-- session_attendance: scans attributed to sessions at write time.
+--
+-- A trigger on scanlog records (badge_id, session_id) for every session
+-- whose window contains the scan, so CE reports become an indexed read of
+-- this table instead of a recomputation over the whole scan history. Every
+-- write path (check_in, check_in_many, journal replays) goes through
+-- scanlog, so all of them are covered.
+--
+-- Session times are conference-local; scan timestamps are converted to
+-- America/Chicago before comparing.
+--
+-- After changing the schedule, rebuild with:
+--     select backfill_session_attendance();    (or python backfill_attendance.py)
+-- When the app's schedule comes from sessions.json, backfill_attendance.py
+-- and the admin page's "Reload schedule" first update this sessions table
+-- to match it (database.sync_sessions).
+
+create table if not exists public.session_attendance (
+    badge_id   bigint      not null,
+    session_id bigint      not null references public.sessions (id) on delete cascade,
+    first_scan timestamptz not null,
+    constraint session_attendance_key unique (badge_id, session_id)
+);
+
+create index if not exists session_attendance_session_idx
+    on public.session_attendance (session_id, badge_id);
+
+create or replace function public.attribute_scan()
+returns trigger
+language plpgsql
+as $$
+begin
+    insert into session_attendance (badge_id, session_id, first_scan)
+    select new.badge_id, s.id, new."timestamp"
+      from sessions s
+     where (new."timestamp" at time zone 'America/Chicago')
+           between s.starts_at and s.ends_at
+    on conflict (badge_id, session_id)
+    do update set first_scan = least(session_attendance.first_scan, excluded.first_scan);
+    return new;
+end;
+$$;
+
+drop trigger if exists scanlog_attribute_scan on public.scanlog;
+create trigger scanlog_attribute_scan
+    after insert on public.scanlog
+    for each row execute function public.attribute_scan();
+
+create or replace function public.backfill_session_attendance()
+returns bigint
+language plpgsql
+as $$
+declare
+    v_count bigint;
+begin
+    delete from session_attendance;
+
+    insert into session_attendance (badge_id, session_id, first_scan)
+    select sc.badge_id, s.id, min(sc."timestamp")
+      from scanlog sc
+      join sessions s
+        on (sc."timestamp" at time zone 'America/Chicago')
+           between s.starts_at and s.ends_at
+     group by sc.badge_id, s.id;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
+
+create or replace view public.session_attendance_view as
+select sa.badge_id,
+       sa.session_id,
+       coalesce(a.name,  '') as name,
+       coalesce(a.email, '') as email
+  from session_attendance sa
+  left join attendees a on a.badge_id = sa.badge_id;
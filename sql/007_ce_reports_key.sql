@@ -0,0 +1,21 @@
+-- Make saving a CE report idempotent.
+--
+-- database.save_ce_report upserts on (badge_id, session_title, report_date),
+-- so re-clicking "Save CE Report" updates rows instead of duplicating them.
+-- Duplicates left by earlier saves are collapsed first (keeping the newest).
+
+delete from ce_reports a
+ using ce_reports b
+ where a.badge_id      = b.badge_id
+   and a.session_title = b.session_title
+   and a.report_date   = b.report_date
+   and a.id < b.id;
+
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'ce_reports_key') then
+        alter table ce_reports
+            add constraint ce_reports_key unique (badge_id, session_title, report_date);
+    end if;
+end;
+$$;
@@ -0,0 +1,32 @@
+-- Track which badges have been printed.
+--
+-- printed_at is stamped by database.mark_badges_printed after each print run
+-- (server-side, see 009_mark_badges_printed.sql);
+-- updated_at moves whenever a badge's printed fields (name, email) change.
+-- Check-ins only touch the scanN columns, so they don't mark a badge as
+-- needing a reprint. badges_to_print lists everyone registered or changed
+-- since their badge was last printed.
+
+alter table attendees add column if not exists printed_at timestamptz;
+alter table attendees add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.touch_attendee_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists attendees_touch_updated_at on public.attendees;
+create trigger attendees_touch_updated_at
+    before update of name, email on public.attendees
+    for each row execute function public.touch_attendee_updated_at();
+
+create or replace view public.badges_to_print as
+select badge_id, name, email, updated_at, printed_at
+  from attendees
+ where printed_at is null
+    or updated_at > printed_at;
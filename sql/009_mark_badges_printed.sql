@@ -0,0 +1,37 @@
+-- mark_badges_printed: stamp printed_at on the server after a print run.
+--
+-- p_badges is [{"badge_id": 1, "updated_at": "..."}, ...] for the badges
+-- that were rendered, each with the updated_at read alongside it. printed_at
+-- comes from the server clock, and is only set where the badge hasn't
+-- changed since it was read: an edit landing between the badges_to_print
+-- read and the stamp (or a skewed kiosk clock) leaves the badge listed for
+-- reprint. Returns the number of badges stamped.
+--
+-- Both timestamps use clock_timestamp() rather than the transaction start
+-- time, so an edit that waited on the stamp's row lock still ends up with
+-- updated_at > printed_at.
+
+create or replace function public.touch_attendee_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := clock_timestamp();
+    return new;
+end;
+$$;
+
+create or replace function public.mark_badges_printed(p_badges jsonb)
+returns integer
+language sql
+as $$
+    with stamped as (
+        update attendees a
+           set printed_at = clock_timestamp()
+          from jsonb_to_recordset(p_badges) as p(badge_id bigint, updated_at timestamptz)
+         where a.badge_id = p.badge_id
+           and a.updated_at <= p.updated_at
+        returning a.badge_id
+    )
+    select count(*)::integer from stamped;
+$$;
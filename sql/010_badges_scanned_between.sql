@@ -0,0 +1,24 @@
+-- badges_scanned_between: every badge with a scan in [p_start, p_end].
+--
+-- The CE report is built from session_attendance, which only has rows for
+-- scans that fell inside a session. Badges that scanned in during the day
+-- but matched no session window still belong in the report (with no marks),
+-- as they did when it was built from the raw scans; this returns them, one
+-- row per badge, without sending the scans themselves to the client.
+-- database.get_badges_scanned_between pages through it by badge_id.
+
+create or replace function public.badges_scanned_between(p_start timestamptz,
+                                                         p_end   timestamptz)
+returns table (badge_id bigint, name text, email text)
+language sql
+stable
+as $$
+    select distinct on (s.badge_id)
+           s.badge_id::bigint,
+           coalesce(a.name,  '')::text,
+           coalesce(a.email, '')::text
+      from scanlog s
+      left join attendees a on a.badge_id = s.badge_id
+     where s."timestamp" between p_start and p_end
+     order by s.badge_id;
+$$;
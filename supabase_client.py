@@ -0,0 +1,82 @@
+# supabase_client.py
+"""
+One Supabase client per process.
+
+database.py, app.py and the other pages all share the client returned by
+get_client(). It is backed by a single httpx.Client, so PostgREST calls
+reuse keep-alive connections (HTTP/2 when the h2 package is installed)
+instead of opening new ones per client, with bounded pool limits and
+timeouts. Pool settings come from the environment:
+
+    SUPABASE_MAX_CONNECTIONS   (default 20)
+    SUPABASE_MAX_KEEPALIVE     (default 10)
+    SUPABASE_KEEPALIVE_EXPIRY  seconds (default 30)
+    SUPABASE_CONNECT_TIMEOUT   seconds (default 5)
+    SUPABASE_TIMEOUT           seconds, read/write/pool (default 15)
+"""
+import atexit
+import os
+import threading
+
+import httpx
+from dotenv import load_dotenv
+from supabase import Client, ClientOptions, create_client
+
+load_dotenv()
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+MAX_CONNECTIONS  = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE    = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+CONNECT_TIMEOUT  = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+TIMEOUT          = float(os.getenv("SUPABASE_TIMEOUT", "15"))
+
+_client: Client | None = None
+_http: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build() -> Client:
+    global _http
+    timeout = httpx.Timeout(TIMEOUT, connect=CONNECT_TIMEOUT)
+    _http = httpx.Client(
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                            max_keepalive_connections=MAX_KEEPALIVE,
+                            keepalive_expiry=KEEPALIVE_EXPIRY),
+        timeout=timeout,
+        http2=_http2_available(),
+        follow_redirects=True,
+    )
+    options = ClientOptions(httpx_client=_http, postgrest_client_timeout=timeout)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+
+
+def get_client() -> Client:
+    """The shared Supabase client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build()
+    return _client
+
+
+def close_client():
+    """Close the pooled connections (registered to run at exit)."""
+    global _client, _http
+    with _client_lock:
+        if _http is not None:
+            _http.close()
+        _client = _http = None
+
+
+atexit.register(close_client)
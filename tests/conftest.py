@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# database.py builds a Supabase client at import; the tests swap in fakes
+# before any query, so placeholder settings are enough
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test")
+os.environ["DB_BACKEND"] = "supabase"
+os.environ.pop("SCAN_JOURNAL_PATH", None)
+os.environ["SCAN_WRITE_BEHIND"] = "0"
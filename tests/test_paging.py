@@ -0,0 +1,54 @@
+import pytest
+
+import database
+from synthetic import InMemorySupabase, _Query, make_conference
+
+MAX_ROWS = 300  # a PostgREST max-rows below the client's PAGE_SIZE
+
+
+class _CappedQuery(_Query):
+    def execute(self):
+        if self.hi is None or self.hi - self.lo > MAX_ROWS:
+            self.hi = self.lo + MAX_ROWS
+        return super().execute()
+
+
+class CappedSupabase(InMemorySupabase):
+    def table(self, name):
+        return _CappedQuery(self, name)
+
+
+@pytest.fixture
+def conf(monkeypatch):
+    conf = make_conference(1200, 2500, 6, 2, seed=4)
+    monkeypatch.setattr(database, "DB_BACKEND", "supabase")
+    monkeypatch.setattr(database, "supabase", CappedSupabase(conf))
+    return conf
+
+
+def test_keyset_walk_survives_short_pages(conf):
+    assert len(database.get_all_attendees()) == len(conf["attendees"])
+
+
+def test_scan_log_survives_short_pages(conf):
+    assert len(database.get_scan_log()) == len(conf["scanlog"])
+    assert len(database.query_scan_log(limit=700)) == 700
+
+
+def test_session_attendance_survives_short_pages(conf):
+    rows = database.get_session_attendance([s.id for s in conf["sessions"]])
+    assert len(rows) == len(conf["session_attendance"])
+
+
+def test_badge_lookup_keeps_id_lists_short(conf, monkeypatch):
+    sizes = []
+    in_ = _CappedQuery.in_
+
+    def record(self, col, values):
+        sizes.append(len(values))
+        return in_(self, col, values)
+
+    monkeypatch.setattr(_CappedQuery, "in_", record, raising=False)
+    rows = database.get_attendees_by_ids(range(1, 451), ("name",))
+    assert [r["badge_id"] for r in rows] == list(range(1, 451))
+    assert sizes and max(sizes) <= database.ID_BATCH_SIZE
@@ -0,0 +1,92 @@
+import datetime
+
+import pandas as pd
+
+from bench_ce_report import legacy_ce_report, make_data
+from reports import ce_report_frame, ce_report_from_attendance
+from schedule import Schedule, Session
+
+DAY = datetime.datetime(2025, 5, 2)
+
+
+def scan(badge_id, hour, minute=0):
+    return {"badge_id": badge_id, "name": f"Attendee {badge_id}",
+            "email": f"a{badge_id}@example.com",
+            "timestamp": DAY.replace(hour=hour, minute=minute)}
+
+
+def session(title, start, end):
+    return {"title": title, "start": f"2025-05-02 {start}", "end": f"2025-05-02 {end}"}
+
+
+def assert_same(new, old):
+    pd.testing.assert_frame_equal(new.reset_index(drop=True),
+                                  old.reset_index(drop=True), check_dtype=False)
+
+
+def test_matches_legacy_on_random_data():
+    logs, sessions = make_data(5000, 15, n_attendees=400, seed=7)
+    assert_same(ce_report_frame(logs, sessions), legacy_ce_report(logs, sessions))
+
+
+def test_empty_logs():
+    sessions = [session("Keynote", "09:00", "10:00")]
+    df = ce_report_frame([], sessions)
+    assert df.empty
+    assert list(df.columns) == ["Badge ID", "Name", "Email", "Keynote"]
+
+
+def test_overlapping_sessions():
+    sessions = [session("Track A", "09:00", "11:00"),
+                session("Track B", "10:00", "12:00")]
+    logs = [scan(1, 9, 30), scan(2, 10, 30), scan(3, 11, 30)]
+    df = ce_report_frame(logs, sessions)
+    assert_same(df, legacy_ce_report(logs, sessions))
+    marks = df.set_index("Badge ID")[["Track A", "Track B"]].to_dict("index")
+    assert marks == {1: {"Track A": "✅", "Track B": ""},
+                     2: {"Track A": "✅", "Track B": "✅"},
+                     3: {"Track A": "", "Track B": "✅"}}
+
+
+def test_window_bounds_are_inclusive():
+    sessions = [session("Keynote", "09:00", "10:00")]
+    logs = [scan(1, 9, 0), scan(2, 10, 0), scan(3, 8, 59), scan(4, 10, 1)]
+    df = ce_report_frame(logs, sessions)
+    assert_same(df, legacy_ce_report(logs, sessions))
+    assert df.set_index("Badge ID")["Keynote"].to_dict() == {1: "✅", 2: "✅", 3: "", 4: ""}
+
+
+def test_from_attendance_matches_scan_report():
+    logs, sessions = make_data(3000, 9, n_attendees=300, seed=3)
+    schedule = Schedule(Session(i + 1, s["title"],
+                                datetime.datetime.strptime(s["start"], "%Y-%m-%d %H:%M"),
+                                datetime.datetime.strptime(s["end"], "%Y-%m-%d %H:%M"))
+                        for i, s in enumerate(sessions))
+    rows = {(l["badge_id"], s.id): {"badge_id": l["badge_id"], "session_id": s.id,
+                                    "name": l["name"], "email": l["email"]}
+            for l in logs for s in schedule.at(l["timestamp"])}
+
+    from_scans = ce_report_frame(logs, schedule.as_dicts())
+    attended = from_scans[schedule.titles].eq("✅").any(axis=1)
+    expected = from_scans[attended].sort_values("Badge ID")
+    assert_same(ce_report_from_attendance(list(rows.values()), schedule.sessions), expected)
+
+
+def test_from_attendance_keeps_badges_that_matched_no_session():
+    logs, sessions = make_data(600, 4, n_attendees=600, seed=3)
+    schedule = Schedule(Session(i + 1, s["title"],
+                                datetime.datetime.strptime(s["start"], "%Y-%m-%d %H:%M"),
+                                datetime.datetime.strptime(s["end"], "%Y-%m-%d %H:%M"))
+                        for i, s in enumerate(sessions))
+    lo, hi = min(s.start for s in schedule), max(s.end for s in schedule)
+    logs = [l for l in logs if lo <= l["timestamp"] <= hi]
+    rows = {(l["badge_id"], s.id): {"badge_id": l["badge_id"], "session_id": s.id,
+                                    "name": l["name"], "email": l["email"]}
+            for l in logs for s in schedule.at(l["timestamp"])}
+    scanned = {l["badge_id"]: {"badge_id": l["badge_id"], "name": l["name"],
+                               "email": l["email"]} for l in logs}
+
+    expected = ce_report_frame(logs, schedule.as_dicts()).sort_values("Badge ID")
+    assert (~expected[schedule.titles].eq("✅").any(axis=1)).any()  # some matched nothing
+    assert_same(ce_report_from_attendance(list(rows.values()), schedule.sessions,
+                                          list(scanned.values())), expected)
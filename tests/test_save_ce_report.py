@@ -0,0 +1,113 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import database
+
+CE_KEY = ("badge_id", "session_title", "report_date")
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeCeReports:
+    """Just enough of the Supabase client for save_ce_report on ce_reports."""
+
+    def __init__(self):
+        self.rows = {}
+        self.upserts = []
+
+    def table(self, name):
+        assert name == "ce_reports"
+        return _Query(self)
+
+
+class _Query:
+    def __init__(self, db):
+        self.db, self.filters, self.orders, self.batch = db, [], [], None
+        self.lo, self.hi = 0, None
+
+    def select(self, columns):
+        self.columns = columns.split(",")
+        return self
+
+    def eq(self, col, value):
+        self.filters.append((col, value))
+        return self
+
+    def order(self, col, desc=False):
+        self.orders.append(col)
+        return self
+
+    def range(self, lo, hi):
+        self.lo, self.hi = lo, hi + 1
+        return self
+
+    def upsert(self, rows, on_conflict):
+        assert tuple(on_conflict.split(",")) == CE_KEY
+        self.batch = rows
+        return self
+
+    def execute(self):
+        if self.batch is not None:
+            self.db.upserts.append(self.batch)
+            for r in self.batch:
+                self.db.rows[tuple(r[k] for k in CE_KEY)] = dict(r)
+            return _Response(self.batch)
+        rows = [r for r in self.db.rows.values()
+                if all(r[c] == v for c, v in self.filters)]
+        rows.sort(key=lambda r: tuple(r[c] for c in self.orders))
+        return _Response([{c: r[c] for c in self.columns} for r in rows[self.lo:self.hi]])
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeCeReports()
+    monkeypatch.setattr(database, "DB_BACKEND", "supabase")
+    monkeypatch.setattr(database, "supabase", fake)
+    monkeypatch.setattr(database, "PAGE_SIZE", 7)  # exercise paging of saved marks
+    return fake
+
+
+def report(n=20):
+    return pd.DataFrame({
+        "Badge ID": range(1, n + 1),
+        "Name": [f"Attendee {i}" for i in range(1, n + 1)],
+        "Email": [f"a{i}@example.com" for i in range(1, n + 1)],
+        "Keynote": ["✅" if i % 2 else "" for i in range(1, n + 1)],
+        "Workshop": ["✅" if i % 3 else "" for i in range(1, n + 1)],
+    })
+
+
+DAY = datetime.date(2025, 5, 2)
+
+
+def test_first_save_writes_every_mark(db):
+    assert database.save_ce_report(report(), DAY, batch_size=8) == 40
+    assert len(db.rows) == 40
+    assert all(len(batch) <= 8 for batch in db.upserts)
+
+
+def test_unchanged_resave_writes_nothing(db):
+    database.save_ce_report(report(), DAY, batch_size=8)
+    db.upserts.clear()
+    assert database.save_ce_report(report(), DAY, batch_size=8) == 0
+    assert db.upserts == []
+
+
+def test_resave_sends_only_changed_marks(db):
+    database.save_ce_report(report(), DAY)
+    db.upserts.clear()
+    df = report()
+    df.loc[df["Badge ID"] == 2, "Keynote"] = "✅"
+    assert database.save_ce_report(df, DAY) == 1
+    assert db.upserts == [[{"badge_id": 2, "session_title": "Keynote",
+                            "attended": True, "report_date": DAY.isoformat()}]]
+
+
+def test_other_dates_are_not_treated_as_saved(db):
+    database.save_ce_report(report(), DAY)
+    assert database.save_ce_report(report(), DAY + datetime.timedelta(days=1)) == 40
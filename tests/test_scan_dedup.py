@@ -0,0 +1,92 @@
+import pytest
+
+import database
+from database import DUPLICATE_SCAN, ScanDedup
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic() for database.py."""
+    now = [1000.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_repeat_inside_window_is_dropped(clock):
+    dedup = ScanDedup(10)
+    assert dedup.admit(1, "k1")
+    clock[0] += 9.9
+    assert not dedup.admit(1, "k1")
+    assert dedup.dropped == 1
+
+
+def test_window_expires(clock):
+    dedup = ScanDedup(10)
+    assert dedup.admit(1, "k1")
+    clock[0] += 10
+    assert dedup.admit(1, "k1")
+    clock[0] += 5
+    assert not dedup.admit(1, "k1")  # the window restarts at the last admitted scan
+    assert dedup.dropped == 1
+
+
+def test_expired_entries_are_pruned(clock):
+    dedup = ScanDedup(10)
+    for badge in range(100):
+        dedup.admit(badge, "k1")
+    clock[0] += 11
+    dedup.admit(500, "k1")
+    assert len(dedup._seen) == 1
+
+
+def test_kiosks_and_badges_are_independent(clock):
+    dedup = ScanDedup(10)
+    assert dedup.admit(1, "k1")
+    assert dedup.admit(1, "k2")
+    assert dedup.admit(2, "k1")
+    assert dedup.dropped == 0
+
+
+def test_zero_window_disables_dedup(clock):
+    dedup = ScanDedup(0)
+    assert dedup.admit(1, "k1")
+    assert dedup.admit(1, "k1")
+    assert dedup.dropped == 0
+
+
+def test_forget_lets_a_retry_through(clock):
+    dedup = ScanDedup(10)
+    assert dedup.admit(1, "k1")
+    dedup.forget(1, "k1")
+    assert dedup.admit(1, "k1")
+
+
+class _FlakyRpc:
+    """supabase.rpc stand-in whose first call raises."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def rpc(self, name, params):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("network down")
+        return self
+
+    def execute(self):
+        return type("Response", (), {"data": "Ann"})()
+
+
+def test_log_scan_retries_after_failed_write(monkeypatch, clock):
+    fake = _FlakyRpc()
+    monkeypatch.setattr(database, "supabase", fake)
+    monkeypatch.setattr(database, "DB_BACKEND", "supabase")
+    monkeypatch.setattr(database, "SCAN_JOURNAL_PATH", None)
+    monkeypatch.setattr(database, "WRITE_BEHIND", False)
+    monkeypatch.setattr(database, "_dedup", ScanDedup(10))
+
+    with pytest.raises(ConnectionError):
+        database.log_scan(7, "k1")
+    assert database.log_scan(7, "k1") == "Ann"
+    assert database.log_scan(7, "k1") is DUPLICATE_SCAN
+    assert fake.calls == 2
@@ -0,0 +1,32 @@
+from scan_journal import ScanJournal
+
+
+def test_sync_drains_pending(tmp_path):
+    journal = ScanJournal(str(tmp_path / "journal.sqlite"))
+    for badge in range(5):
+        journal.append(badge, "2025-05-02T09:00:00-05:00")
+    written = []
+    assert journal.sync_once(written.extend, batch_size=2) == 5
+    assert [s["badge_id"] for s in written] == list(range(5))
+    assert journal.pending_count() == 0
+
+
+def test_synced_rows_are_dropped_after_retention(tmp_path, monkeypatch):
+    import scan_journal
+    now = [1_000_000.0]
+    monkeypatch.setattr(scan_journal.time, "time", lambda: now[0])
+    journal = ScanJournal(str(tmp_path / "journal.sqlite"), retention=60)
+    journal.append(1, "2025-05-02T09:00:00-05:00", "a")
+    journal.sync_once(lambda scans: None)
+
+    now[0] += 30
+    journal.append(1, "2025-05-02T09:00:00-05:00", "a")  # replay inside the window
+    journal.append(2, "2025-05-02T09:00:30-05:00", "b")
+    assert journal.pending_count() == 1
+    journal.sync_once(lambda scans: None)
+
+    now[0] += 45  # "a" is past retention, "b" isn't
+    journal.append(3, "2025-05-02T09:01:15-05:00", "c")
+    journal.sync_once(lambda scans: None)
+    rows = journal._conn.execute("SELECT client_id FROM scans ORDER BY id").fetchall()
+    assert [r[0] for r in rows] == ["b", "c"]
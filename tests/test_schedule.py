@@ -0,0 +1,85 @@
+import datetime
+import random
+
+import database
+import schedule as schedule_module
+
+from schedule import Schedule, Session
+
+
+def at(day, hour, minute=0):
+    return datetime.datetime(2025, 5, day, hour, minute)
+
+
+# an all-day session overlapping shorter ones, two sessions sharing a
+# boundary, and a second day
+SESSIONS = [
+    Session(1, "Expo Hall", at(2, 8), at(2, 17)),
+    Session(2, "Keynote", at(2, 9), at(2, 10)),
+    Session(3, "Track A", at(2, 10), at(2, 11)),
+    Session(4, "Track B", at(2, 10, 30), at(2, 12)),
+    Session(5, "Day Two", at(3, 9), at(3, 10)),
+]
+
+
+def ids(sessions):
+    return sorted(s.id for s in sessions)
+
+
+def test_at_overlapping_windows():
+    schedule = Schedule(SESSIONS)
+    assert ids(schedule.at(at(2, 7, 59))) == []
+    assert ids(schedule.at(at(2, 9, 30))) == [1, 2]
+    assert ids(schedule.at(at(2, 10, 45))) == [1, 3, 4]
+    assert ids(schedule.at(at(2, 13))) == [1]
+    assert ids(schedule.at(at(3, 9, 30))) == [5]
+
+
+def test_at_includes_both_boundaries():
+    schedule = Schedule(SESSIONS)
+    assert ids(schedule.at(at(2, 8))) == [1]
+    assert ids(schedule.at(at(2, 10))) == [1, 2, 3]  # Keynote ends as Track A starts
+    assert ids(schedule.at(at(2, 17))) == [1]
+    assert ids(schedule.at(at(2, 17, 1))) == []
+
+
+def test_at_matches_a_linear_scan():
+    rng = random.Random(5)
+    sessions = []
+    for i in range(60):
+        start = at(2, 8) + datetime.timedelta(minutes=rng.randrange(0, 600, 15))
+        sessions.append(Session(i, f"S{i}", start,
+                                start + datetime.timedelta(minutes=rng.choice([30, 60, 240]))))
+    schedule = Schedule(sessions)
+    for minute in range(0, 900, 5):
+        t = at(2, 8) + datetime.timedelta(minutes=minute)
+        assert ids(schedule.at(t)) == ids(s for s in sessions if s.start <= t <= s.end)
+
+
+def test_empty_schedule():
+    assert Schedule([]).at(at(2, 9)) == []
+
+
+def test_for_date():
+    schedule = Schedule(SESSIONS)
+    assert ids(schedule.for_date(datetime.date(2025, 5, 2))) == [1, 2, 3, 4]
+    assert ids(schedule.for_date(datetime.date(2025, 5, 3))) == [5]
+    assert len(schedule.for_date(datetime.date(2025, 5, 4))) == 0
+    assert schedule.dates() == [datetime.date(2025, 5, 2), datetime.date(2025, 5, 3)]
+
+
+def test_sessions_sync_check_is_remembered_per_schedule(monkeypatch):
+    reads = []
+
+    def load_schedule_db():
+        reads.append(1)
+        return Schedule(SESSIONS[:2])
+
+    monkeypatch.setattr(schedule_module, "load_schedule_db", load_schedule_db)
+    monkeypatch.setattr(database, "_sessions_sync_state", (None, False))
+    loaded = Schedule(SESSIONS)
+    assert database.sessions_out_of_sync(loaded)
+    assert database.sessions_out_of_sync(loaded)
+    assert len(reads) == 1
+    assert not database.sessions_out_of_sync(Schedule(SESSIONS[:2]))  # a reload
+    assert len(reads) == 2